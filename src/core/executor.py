@@ -6,9 +6,12 @@ Handles safe, monitored Python code execution with multiple security strategies
 
 import asyncio
 import ast
+import functools
 import time
 import json
 import hashlib
+import math
+import re
 import multiprocess as mp
 import traceback
 import sys
@@ -16,12 +19,15 @@ import io
 import os
 import signal
 import resource
+import weakref
 import psutil
+from collections import OrderedDict
 from contextlib import contextmanager, redirect_stdout, redirect_stderr
 from dataclasses import dataclass
 from typing import Dict, List, Any, Optional, Tuple
 from enum import Enum
 from pathlib import Path
+from types import CodeType
 
 # Try to import optional dependencies
 try:
@@ -36,6 +42,45 @@ try:
 except ImportError:
     HAS_ASTEVAL = False
 
+# Source patterns rejected before execution, with a description of each
+DANGEROUS_PATTERNS: Tuple[Tuple[str, str], ...] = (
+    ('import os', 'File system access'),
+    ('import sys', 'System access'),
+    ('import subprocess', 'Process execution'),
+    ('import socket', 'Network access'),
+    ('open(', 'File operations'),
+    ('eval(', 'Code evaluation'),
+    ('exec(', 'Code execution'),
+    ('__import__', 'Dynamic imports'),
+    ('getattr(', 'Attribute access'),
+    ('setattr(', 'Attribute modification'),
+    ('globals()', 'Global namespace access'),
+    ('locals()', 'Local namespace access'),
+)
+
+# Every pattern folded into one alternation so the source is scanned in a
+# single pass; the lookahead lets matches overlap like the substring checks did
+_DANGEROUS_RE = re.compile(
+    "(?=(" + "|".join(re.escape(pattern) for pattern, _ in DANGEROUS_PATTERNS) + "))"
+)
+
+@functools.lru_cache(maxsize=1024)
+def _scan_security_patterns(code: str) -> Tuple[str, ...]:
+    """Return the security issues found in code, memoized per source string"""
+    found = {match.group(1) for match in _DANGEROUS_RE.finditer(code)}
+    if not found:
+        return ()
+    return tuple(
+        f"{description} ({pattern})"
+        for pattern, description in DANGEROUS_PATTERNS
+        if pattern in found
+    )
+
+@functools.lru_cache(maxsize=256)
+def _compile_code(code: str) -> CodeType:
+    """Compile source to a code object, reusing it for repeated snippets"""
+    return compile(code, '<string>', 'exec')
+
 class ExecutionStatus(Enum):
     """Execution result status"""
     SUCCESS = "success"
@@ -78,6 +123,9 @@ class ExecutionResult:
 class SecurityStrategy:
     """Base class for security strategies"""
     
+    # True if execute() enforces the timeout itself instead of relying on the caller
+    manages_timeout = False
+    
     def can_handle(self, code: str) -> bool:
         """Check if this strategy can handle the given code"""
         raise NotImplementedError
@@ -89,6 +137,12 @@ class SecurityStrategy:
     async def execute(self, code: str, timeout: float) -> Tuple[str, str, bool]:
         """Execute code and return (output, error, success)"""
         raise NotImplementedError
+    
+    async def timed_execute(self, code: str, timeout: float) -> Tuple[str, str, bool, float]:
+        """Execute code and also return how long the run itself took, in ms"""
+        start_time = time.perf_counter()
+        output, error, success = await self.execute(code, timeout)
+        return output, error, success, (time.perf_counter() - start_time) * 1000
 
 class RestrictedPythonStrategy(SecurityStrategy):
     """RestrictedPython-based execution strategy"""
@@ -102,11 +156,15 @@ class RestrictedPythonStrategy(SecurityStrategy):
     
     def _is_safe_for_restricted(self, code: str) -> bool:
         """Check if code is suitable for RestrictedPython"""
+        # Check for dangerous operations first; substring scans are far
+        # cheaper than parsing and rule most unsuitable code out
+        dangerous_patterns = ['import os', 'import sys', 'open(', 'file(']
+        if any(pattern in code for pattern in dangerous_patterns):
+            return False
+        
         try:
             ast.parse(code)
-            # Check for dangerous operations
-            dangerous_patterns = ['import os', 'import sys', 'open(', 'file(']
-            return not any(pattern in code for pattern in dangerous_patterns)
+            return True
         except:
             return False
     
@@ -186,9 +244,100 @@ class ASTEvalStrategy(SecurityStrategy):
         except Exception as e:
             return output_buffer.getvalue(), str(e), False
 
+def _run_code_isolated(code_str: str, timeout: float) -> Dict[str, Any]:
+    """Run code in a pool worker process with resource limits applied"""
+    try:
+        # Set resource limits
+        max_memory = 256 * 1024 * 1024  # 256MB
+        resource.setrlimit(resource.RLIMIT_AS, (max_memory, max_memory))
+        # CPU limit is only a backstop: kept above the parent's wall-clock
+        # timeout so a runaway loop is reported as timed out, not as a crash
+        cpu_limit = math.ceil(timeout) + 1
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_limit, cpu_limit))
+        
+        # Capture output
+        output_buffer = io.StringIO()
+        error_buffer = io.StringIO()
+        
+        with redirect_stdout(output_buffer), redirect_stderr(error_buffer):
+            # Create restricted globals
+            restricted_globals = {
+                '__builtins__': {
+                    'print': print,
+                    'len': len,
+                    'range': range,
+                    'str': str,
+                    'int': int,
+                    'float': float,
+                    'list': list,
+                    'dict': dict,
+                    'tuple': tuple,
+                    'set': set,
+                    'min': min,
+                    'max': max,
+                    'sum': sum,
+                    'abs': abs,
+                    'round': round,
+                    'sorted': sorted,
+                    'enumerate': enumerate,
+                    'zip': zip,
+                    'map': map,
+                    'filter': filter,
+                    'True': True,
+                    'False': False,
+                    'None': None,
+                }
+            }
+            
+            exec(_compile_code(code_str), restricted_globals)
+        
+        return {
+            'success': True,
+            'output': output_buffer.getvalue(),
+            'error': error_buffer.getvalue()
+        }
+        
+    except Exception as e:
+        return {
+            'success': False,
+            'output': '',
+            'error': f"{type(e).__name__}: {str(e)}\n{traceback.format_exc()}"
+        }
+
+def _run_code_in_child(code_str: str, timeout: float, conn):
+    """Process entry point: run the code and send the result back over the pipe"""
+    try:
+        conn.send(_run_code_isolated(code_str, timeout))
+    finally:
+        conn.close()
+
+def _resolve_future(future: asyncio.Future, result: Any):
+    """Complete a pending future unless it was already cancelled or timed out"""
+    if not future.done():
+        future.set_result(result)
+
+# Upper bound on subprocess executions running at once, shared by every executor
+MAX_SUBPROCESS_WORKERS = os.cpu_count() or 1
+
+# Event loop -> semaphore enforcing MAX_SUBPROCESS_WORKERS on that loop
+_subprocess_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+def _subprocess_slot() -> asyncio.Semaphore:
+    """Get the running loop's shared subprocess semaphore, creating it on first use"""
+    loop = asyncio.get_running_loop()
+    slots = _subprocess_slots.get(loop)
+    if slots is None:
+        slots = _subprocess_slots[loop] = asyncio.Semaphore(MAX_SUBPROCESS_WORKERS)
+    return slots
+
 class SubprocessStrategy(SecurityStrategy):
     """Subprocess-based execution with maximum isolation"""
     
+    # Enforces its own timeout, which only starts once the process is running
+    manages_timeout = True
+    
     def can_handle(self, code: str) -> bool:
         """Subprocess can handle any code"""
         return True
@@ -198,86 +347,57 @@ class SubprocessStrategy(SecurityStrategy):
     
     async def execute(self, code: str, timeout: float) -> Tuple[str, str, bool]:
         """Execute in isolated subprocess"""
+        output, error, success, _ = await self.timed_execute(code, timeout)
+        return output, error, success
+    
+    async def timed_execute(self, code: str, timeout: float) -> Tuple[str, str, bool, float]:
+        """Execute in isolated subprocess, timing only the run itself"""
+        # Compile in the parent: syntax errors come back without waiting for a
+        # slot or starting a process, and a forked child inherits the warm cache
+        try:
+            _compile_code(code)
+        except (SyntaxError, ValueError) as e:
+            return "", f"{type(e).__name__}: {e}", False, 0.0
         
-        def run_code_isolated(code_str: str, queue: mp.Queue):
-            """Run code in isolated process"""
-            try:
-                # Set resource limits
-                max_memory = 256 * 1024 * 1024  # 256MB
-                resource.setrlimit(resource.RLIMIT_AS, (max_memory, max_memory))
-                resource.setrlimit(resource.RLIMIT_CPU, (int(timeout), int(timeout)))
-                
-                # Capture output
-                output_buffer = io.StringIO()
-                error_buffer = io.StringIO()
-                
-                with redirect_stdout(output_buffer), redirect_stderr(error_buffer):
-                    # Create restricted globals
-                    restricted_globals = {
-                        '__builtins__': {
-                            'print': print,
-                            'len': len,
-                            'range': range,
-                            'str': str,
-                            'int': int,
-                            'float': float,
-                            'list': list,
-                            'dict': dict,
-                            'tuple': tuple,
-                            'set': set,
-                            'min': min,
-                            'max': max,
-                            'sum': sum,
-                            'abs': abs,
-                            'round': round,
-                            'sorted': sorted,
-                            'enumerate': enumerate,
-                            'zip': zip,
-                            'map': map,
-                            'filter': filter,
-                            'True': True,
-                            'False': False,
-                            'None': None,
-                        }
-                    }
-                    
-                    exec(code_str, restricted_globals)
-                
-                queue.put({
-                    'success': True,
-                    'output': output_buffer.getvalue(),
-                    'error': error_buffer.getvalue()
-                })
-                
-            except Exception as e:
-                queue.put({
-                    'success': False,
-                    'output': '',
-                    'error': f"{type(e).__name__}: {str(e)}\n{traceback.format_exc()}"
-                })
-        
-        # Create queue for communication
-        queue = mp.Queue()
-        
-        # Create and start process
-        process = mp.Process(target=run_code_isolated, args=(code, queue))
+        # The shared semaphore bounds how many processes run at once; time
+        # spent waiting for a slot is charged to neither the timeout nor the
+        # reported execution time.
+        async with _subprocess_slot():
+            start_time = time.perf_counter()
+            output, error, success = await self._run_in_process(code, timeout)
+            return output, error, success, (time.perf_counter() - start_time) * 1000
+    
+    async def _run_in_process(self, code: str, timeout: float) -> Tuple[str, str, bool]:
+        """Run code in a fresh process, killing it if it outlives the timeout"""
+        # Every run gets its own process, so a runaway snippet can be killed
+        # without affecting any other execution
+        loop = asyncio.get_running_loop()
+        recv_conn, send_conn = mp.Pipe(duplex=False)
+        process = mp.Process(target=_run_code_in_child, args=(code, timeout, send_conn), daemon=True)
         process.start()
+        send_conn.close()  # So the pipe reports EOF if the child dies without answering
         
-        # Wait for completion with timeout
-        process.join(timeout=timeout)
-        
-        if process.is_alive():
-            # Timeout occurred
-            process.terminate()
-            process.join()
-            return "", f"Code execution timed out after {timeout} seconds", False
-        
-        # Get result
+        # Wait for the result (or EOF) without blocking the event loop
+        ready = loop.create_future()
+        fd = recv_conn.fileno()
+        loop.add_reader(fd, _resolve_future, ready, None)
         try:
-            result = queue.get_nowait()
-            return result['output'], result['error'], result['success']
-        except:
+            try:
+                await asyncio.wait_for(ready, timeout=timeout)
+            finally:
+                loop.remove_reader(fd)
+            result = recv_conn.recv()
+        except asyncio.TimeoutError:
+            return "", f"Code execution timed out after {timeout} seconds", False
+        except EOFError:
             return "", "Failed to retrieve execution result", False
+        finally:
+            if process.is_alive():
+                process.kill()
+            process.join()
+            recv_conn.close()
+        
+        return result['output'], result['error'], result['success']
 
 class BasicSandboxStrategy(SecurityStrategy):
     """Basic sandboxed execution for simple code"""
@@ -330,7 +450,7 @@ class BasicSandboxStrategy(SecurityStrategy):
             safe_globals = {'__builtins__': safe_builtins}
             
             with redirect_stdout(output_buffer), redirect_stderr(error_buffer):
-                exec(code, safe_globals)
+                exec(_compile_code(code), safe_globals)
             
             return output_buffer.getvalue(), error_buffer.getvalue(), True
             
@@ -343,7 +463,11 @@ class CodeExecutor:
     def __init__(self, timeout: float = 10.0, memory_limit_mb: int = 256):
         self.timeout = timeout
         self.memory_limit = memory_limit_mb * 1024 * 1024
-        self.execution_cache = {}
+        self.execution_cache: "OrderedDict[str, ExecutionResult]" = OrderedDict()
+        self.cache_size = 512
+        
+        # Prime psutil's CPU counters so later samples can be non-blocking
+        self._get_cpu_percent()
         
         # Initialize security strategies in order of preference
         self.strategies = [
@@ -386,6 +510,7 @@ class CodeExecutor:
         
         # Check cache first
         if cache_key in self.execution_cache:
+            self.execution_cache.move_to_end(cache_key)
             cached_result = self.execution_cache[cache_key]
             # Update timestamp but keep other data
             cached_result.code_hash = code_hash
@@ -407,12 +532,16 @@ class CodeExecutor:
         start_memory = self._get_memory_usage()
         
         try:
-            output, error, success = await asyncio.wait_for(
-                strategy.execute(code, self.timeout),
-                timeout=self.timeout
-            )
+            # The strategy times its own run, so waiting for a worker slot
+            # doesn't inflate the reported execution time
+            if strategy.manages_timeout:
+                output, error, success, execution_time = await strategy.timed_execute(code, self.timeout)
+            else:
+                output, error, success, execution_time = await asyncio.wait_for(
+                    strategy.timed_execute(code, self.timeout),
+                    timeout=self.timeout
+                )
             
-            execution_time = (time.time() - start_time) * 1000
             memory_used = self._get_memory_usage() - start_memory
             cpu_percent = self._get_cpu_percent()
             
@@ -434,6 +563,8 @@ class CodeExecutor:
             # Cache successful results
             if status == ExecutionStatus.SUCCESS:
                 self.execution_cache[cache_key] = result
+                if len(self.execution_cache) > self.cache_size:
+                    self.execution_cache.popitem(last=False)
             
             return result
             
@@ -475,29 +606,7 @@ class CodeExecutor:
     
     def _security_check(self, code: str) -> List[str]:
         """Perform security checks on code"""
-        issues = []
-        
-        # Basic security patterns
-        dangerous_patterns = [
-            ('import os', 'File system access'),
-            ('import sys', 'System access'),
-            ('import subprocess', 'Process execution'),
-            ('import socket', 'Network access'),
-            ('open(', 'File operations'),
-            ('eval(', 'Code evaluation'),
-            ('exec(', 'Code execution'),
-            ('__import__', 'Dynamic imports'),
-            ('getattr(', 'Attribute access'),
-            ('setattr(', 'Attribute modification'),
-            ('globals()', 'Global namespace access'),
-            ('locals()', 'Local namespace access'),
-        ]
-        
-        for pattern, description in dangerous_patterns:
-            if pattern in code:
-                issues.append(f"{description} ({pattern})")
-        
-        return issues
+        return list(_scan_security_patterns(code))
     
     def _get_memory_usage(self) -> int:
         """Get current memory usage in bytes"""
@@ -510,7 +619,9 @@ class CodeExecutor:
     def _get_cpu_percent(self) -> float:
         """Get current CPU usage percentage"""
         try:
-            return psutil.cpu_percent(interval=0.1)
+            # interval=None compares against the previous call instead of
+            # sleeping, so sampling never stalls the event loop
+            return psutil.cpu_percent(interval=None)
         except:
             return 0.0
     
@@ -609,7 +720,7 @@ class SimpleExecutor:
                     }
                 }
                 
-                exec(code, safe_globals)
+                exec(_compile_code(code), safe_globals)
             
             execution_time = (time.time() - start_time) * 1000
             
@@ -14,11 +14,28 @@ from typing import Dict, List, Any, Optional, Tuple, Set
 from dataclasses import dataclass, asdict
 from collections import defaultdict, deque
 from datetime import datetime, timedelta
+from statistics import fmean
 import re
 import ast
 
 from .executor import ExecutionResult, ExecutionStatus
 
+# Optional fast JSON encoder for persisted learning data
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+def _write_json(path: Path, data: Any):
+    """Write data as indented JSON, serializing with orjson when available"""
+    if HAS_ORJSON:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
+
 @dataclass
 class CodingPattern:
     """Represents a learned coding pattern"""
@@ -105,20 +122,24 @@ class PatternExtractor:
         
         # Indentation preference
         lines = code.split('\n')
-        indented_lines = [line for line in lines if line.startswith((' ', '\t'))]
-        if indented_lines:
-            spaces = sum(1 for line in indented_lines if line.startswith('    '))
-            tabs = sum(1 for line in indented_lines if line.startswith('\t'))
+        
+        # Single pass over the lines instead of building and rescanning a list
+        spaces = 0
+        tabs = 0
+        space_counts = []
+        for line in lines:
+            if line.startswith(' '):
+                if line.startswith('    '):
+                    spaces += 1
+                space_counts.append(len(line) - len(line.lstrip(' ')))
+            elif line.startswith('\t'):
+                tabs += 1
+        
+        if space_counts or tabs:
             preferences['indentation'] = 'spaces' if spaces > tabs else 'tabs'
             if spaces > 0:
                 # Detect space count
-                space_counts = []
-                for line in indented_lines:
-                    if line.startswith(' '):
-                        count = len(line) - len(line.lstrip(' '))
-                        space_counts.append(count)
-                if space_counts:
-                    preferences['spaces_per_indent'] = max(set(space_counts), key=space_counts.count)
+                preferences['spaces_per_indent'] = max(set(space_counts), key=space_counts.count)
         
         # Naming conventions
         function_names = re.findall(r'def\s+([a-zA-Z_][a-zA-Z0-9_]*)', code)
@@ -264,6 +285,9 @@ class LearningSystem:
         self.execution_history = deque(maxlen=1000)
         self.error_history = deque(maxlen=500)
         
+        # Serializes background saves; created lazily to bind to the running loop
+        self._save_lock: Optional[asyncio.Lock] = None
+        
         # Load existing data
         self._load_learning_data()
         
@@ -428,19 +452,19 @@ class LearningSystem:
             return {"message": "No execution history available"}
         
         # Calculate success rate over time
-        recent_executions = list(self.execution_history)[-50:]  # Last 50 executions
-        older_executions = list(self.execution_history)[-100:-50]  # Previous 50
+        history = list(self.execution_history)
+        recent_executions = history[-50:]  # Last 50 executions
+        older_executions = history[-100:-50]  # Previous 50
         
-        recent_success_rate = sum(1 for ex in recent_executions if ex["success"]) / len(recent_executions)
-        older_success_rate = sum(1 for ex in older_executions if ex["success"]) / len(older_executions) if older_executions else 0
+        # One pass per window; failures are whatever didn't succeed
+        recent_successes = sum(1 for ex in recent_executions if ex["success"])
+        older_successes = sum(1 for ex in older_executions if ex["success"])
         
-        # Calculate learning velocity
-        confidence_sum = sum(p.confidence for p in self.coding_patterns.values())
-        avg_confidence = confidence_sum / len(self.coding_patterns) if self.coding_patterns else 0
+        recent_success_rate = recent_successes / len(recent_executions)
+        older_success_rate = older_successes / len(older_executions) if older_executions else 0
         
-        # Error reduction analysis
-        recent_errors = [ex for ex in recent_executions if not ex["success"]]
-        older_errors = [ex for ex in older_executions if not ex["success"]]
+        # Calculate learning velocity
+        avg_confidence = fmean(p.confidence for p in self.coding_patterns.values()) if self.coding_patterns else 0
         
         return {
             "total_executions": len(self.execution_history),
@@ -448,8 +472,8 @@ class LearningSystem:
             "older_success_rate": older_success_rate,
             "success_improvement": recent_success_rate - older_success_rate,
             "average_pattern_confidence": avg_confidence,
-            "recent_error_count": len(recent_errors),
-            "older_error_count": len(older_errors),
+            "recent_error_count": len(recent_executions) - recent_successes,
+            "older_error_count": len(older_executions) - older_successes,
             "learning_velocity": avg_confidence * len(self.coding_patterns)
         }
     
@@ -559,7 +583,7 @@ class LearningSystem:
         
         # Estimate experience level
         total_executions = len(self.execution_history)
-        avg_confidence = sum(p.confidence for p in self.coding_patterns.values()) / len(self.coding_patterns) if self.coding_patterns else 0
+        avg_confidence = fmean(p.confidence for p in self.coding_patterns.values()) if self.coding_patterns else 0
         
         if total_executions < 20 or avg_confidence < 0.3:
             dna["experience_level"] = "Beginner"
@@ -614,20 +638,9 @@ class LearningSystem:
     async def _save_learning_data(self):
         """Save learning data to disk"""
         try:
-            # Save patterns
-            patterns_file = self.data_dir / "patterns.json"
+            # Snapshot on the event loop so the data can't change mid-write
             patterns_data = {pid: pattern.to_dict() for pid, pattern in self.coding_patterns.items()}
-            with open(patterns_file, 'w') as f:
-                json.dump(patterns_data, f, indent=2)
-            
-            # Save preferences
-            prefs_file = self.data_dir / "preferences.json"
             prefs_data = {ptype: pref.to_dict() for ptype, pref in self.user_preferences.items()}
-            with open(prefs_file, 'w') as f:
-                json.dump(prefs_data, f, indent=2)
-            
-            # Save execution history (recent subset)
-            history_file = self.data_dir / "execution_history.json"
             recent_history = [
                 {
                     "timestamp": record["timestamp"].isoformat(),
@@ -637,13 +650,31 @@ class LearningSystem:
                 }
                 for record in list(self.execution_history)[-100:]  # Keep last 100
             ]
-            with open(history_file, 'w') as f:
-                json.dump(recent_history, f, indent=2)
+            
+            # Serialization and file I/O happen in a worker thread, one save at a time
+            if self._save_lock is None:
+                self._save_lock = asyncio.Lock()
+            async with self._save_lock:
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(
+                    None, self._write_learning_files, patterns_data, prefs_data, recent_history
+                )
         
         except Exception as e:
             # Silently handle save errors to not disrupt operation
             pass
     
+    def _write_learning_files(
+        self,
+        patterns_data: Dict[str, Any],
+        prefs_data: Dict[str, Any],
+        recent_history: List[Dict[str, Any]]
+    ):
+        """Write a learning data snapshot to disk"""
+        _write_json(self.data_dir / "patterns.json", patterns_data)
+        _write_json(self.data_dir / "preferences.json", prefs_data)
+        _write_json(self.data_dir / "execution_history.json", recent_history)
+    
     def _load_learning_data(self):
         """Load learning data from disk"""
         try:
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Event Loop Runner
+Runs entry-point coroutines on uvloop when it is installed, else on the default loop
+"""
+
+import asyncio
+import sys
+
+# Optional libuv-based event loop
+try:
+    import uvloop
+    HAS_UVLOOP = True
+except ImportError:
+    HAS_UVLOOP = False
+
+def run(coro):
+    """Run a coroutine on uvloop when it is installed, else on the default loop"""
+    if not HAS_UVLOOP:
+        return asyncio.run(coro)
+    
+    if sys.version_info >= (3, 11):
+        return uvloop.run(coro)
+    
+    uvloop.install()
+    return asyncio.run(coro)
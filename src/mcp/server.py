@@ -5,13 +5,20 @@ Main entry point for the MCP server with comprehensive AI code execution capabil
 """
 
 import asyncio
+import functools
+import hashlib
 import json
 import sys
 import logging
+import logging.handlers
+import queue
 import time
 import os
+from collections import OrderedDict
+from contextlib import AsyncExitStack
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from statistics import fmean
+from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
 # Add the source directory to Python path
@@ -33,18 +40,30 @@ except ImportError as e:
     print("📦 Install with: pip install mcp", file=sys.stderr)
     MCP_AVAILABLE = False
 
+# Optional fast JSON encoder for tool responses
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+from core.runner import run
+
 # Import core execution components
 try:
     from core.executor import CodeExecutor, ExecutionResult, ExecutionStatus
     from core.quantum_debugger import QuantumDebugger
     from core.learning_system import LearningSystem
-    from monitoring.performance_monitor import PerformanceMonitor
+    from monitoring.monitoring_dashboard import PerformanceMonitor
     CORE_AVAILABLE = True
 except ImportError as e:
     print(f"⚠️  Core components not fully available: {e}", file=sys.stderr)
     CORE_AVAILABLE = False
 
-@dataclass
+# Slotted dataclasses need Python 3.10+; older interpreters keep the __dict__ layout
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class ServerConfig:
     """Server configuration from environment variables"""
     debug_mode: bool = False
@@ -54,46 +73,385 @@ class ServerConfig:
     enable_learning: bool = True
     enable_monitoring: bool = True
     log_level: str = "INFO"
+    log_format: str = "text"  # text, json
+    log_queue_size: int = 4096
     
     @classmethod
     def from_environment(cls) -> 'ServerConfig':
-        """Load configuration from environment variables"""
-        return cls(
-            debug_mode=os.getenv("MCP_DEBUG", "false").lower() == "true",
-            max_execution_time=float(os.getenv("MCP_MAX_EXEC_TIME", "10.0")),
-            max_memory_mb=int(os.getenv("MCP_MAX_MEMORY_MB", "256")),
-            enable_quantum=os.getenv("MCP_ENABLE_QUANTUM", "true").lower() == "true",
-            enable_learning=os.getenv("MCP_ENABLE_LEARNING", "true").lower() == "true",
-            enable_monitoring=os.getenv("MCP_ENABLE_MONITORING", "true").lower() == "true",
-            log_level=os.getenv("MCP_LOG_LEVEL", "INFO")
+        """Load configuration from environment variables (parsed once per process)"""
+        return _load_env_config()
+
+@functools.lru_cache(maxsize=1)
+def _load_env_config() -> ServerConfig:
+    """Read and parse the MCP_* environment variables; call cache_clear() to re-read"""
+    return ServerConfig(
+        debug_mode=os.getenv("MCP_DEBUG", "false").lower() == "true",
+        max_execution_time=float(os.getenv("MCP_MAX_EXEC_TIME", "10.0")),
+        max_memory_mb=int(os.getenv("MCP_MAX_MEMORY_MB", "256")),
+        enable_quantum=os.getenv("MCP_ENABLE_QUANTUM", "true").lower() == "true",
+        enable_learning=os.getenv("MCP_ENABLE_LEARNING", "true").lower() == "true",
+        enable_monitoring=os.getenv("MCP_ENABLE_MONITORING", "true").lower() == "true",
+        log_level=os.getenv("MCP_LOG_LEVEL", "INFO"),
+        log_format=os.getenv("MCP_LOG_FORMAT", "text").lower(),
+        log_queue_size=int(os.getenv("MCP_LOG_QUEUE_SIZE", "4096"))
+    )
+
+# Circuit breaker for repeated identical failures (same tool, same code)
+CIRCUIT_FAILURE_THRESHOLD = 3
+CIRCUIT_WINDOW_SECONDS = 30.0
+CIRCUIT_MAX_SIGNATURES = 1024
+
+# Seconds stop() waits for room in a full log queue before evicting records
+LOG_SENTINEL_TIMEOUT = 1.0
+
+# Attributes every LogRecord has; anything else was passed via `extra=`
+_STANDARD_RECORD_ATTRS = frozenset(logging.makeLogRecord({}).__dict__) | {"message", "asctime"}
+
+class JsonLogFormatter(logging.Formatter):
+    """Emit one JSON object per record, including any `extra=` fields"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage()
+        }
+        for key, value in record.__dict__.items():
+            if key not in _STANDARD_RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack_info"] = self.formatStack(record.stack_info)
+        
+        if HAS_ORJSON:
+            return orjson.dumps(entry, default=str).decode()
+        return json.dumps(entry, default=str)
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records instead of blocking when its queue is full"""
+    
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Pass the record through untouched: the stock prepare() formats it in
+        # the caller and clears args/exc_info, so the listener's formatter would
+        # format an already-formatted message. All formatting happens there.
+        return record
+    
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class BoundedQueueListener(logging.handlers.QueueListener):
+    """QueueListener whose stop() still works when the bounded queue is full"""
+    
+    def enqueue_sentinel(self):
+        # Give the listener a moment to make room; if the sink is stalled,
+        # evict the oldest queued records until the stop sentinel fits
+        try:
+            self.queue.put(self._sentinel, timeout=LOG_SENTINEL_TIMEOUT)
+            return
+        except queue.Full:
+            pass
+        while True:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                self.queue.put_nowait(self._sentinel)
+                return
+            except queue.Full:
+                continue
+
+class CoalescingStreamHandler(logging.StreamHandler):
+    """StreamHandler that joins bursts of queued records into a single write"""
+    
+    def __init__(self, stream, log_queue: queue.Queue, max_batch: int = 64):
+        super().__init__(stream)
+        self._log_queue = log_queue
+        self._max_batch = max_batch
+        self._pending: List[str] = []
+    
+    def emit(self, record: logging.LogRecord):
+        try:
+            self._pending.append(self.format(record))
+            # Write once the burst is drained (or large), not once per record
+            if len(self._pending) >= self._max_batch or self._log_queue.empty():
+                self.flush()
+        except Exception:
+            self.handleError(record)
+    
+    def flush(self):
+        self.acquire()
+        try:
+            if self._pending and self.stream:
+                self.stream.write(self.terminator.join(self._pending) + self.terminator)
+                self._pending.clear()
+            super().flush()
+        finally:
+            self.release()
+
+@functools.lru_cache(maxsize=None)
+def _static_error(message: str) -> "CallToolResult":
+    """Pre-built error result for fixed messages; shared, so callers must not mutate it"""
+    return CallToolResult(
+        content=[TextContent(type="text", text=message)],
+        isError=True
+    )
+
+def _batch_operation_error(operation: Any) -> Optional[str]:
+    """Describe why a batch operation can't be run, or return None if it can"""
+    if not isinstance(operation, dict):
+        return f"Batch operation must be an object, got {type(operation).__name__}"
+    tool = operation.get("tool")
+    if not isinstance(tool, str) or not tool:
+        return "Batch operation is missing a tool name"
+    if tool == "batch_execute":
+        return "Nested batch_execute calls are not supported"
+    if not isinstance(operation.get("arguments", {}), dict):
+        return "Batch operation arguments must be an object"
+    return None
+
+@functools.lru_cache(maxsize=2)
+def _build_tools(enable_quantum: bool) -> Tuple["Tool", ...]:
+    """Build the tool definitions once per process (keyed on the only config-dependent default)"""
+    return (
+        Tool(
+            name="execute_code",
+            description="Execute Python code with real-time testing, optimization, and validation. Claude should use this BEFORE presenting any code to users to ensure it works correctly.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "code": {
+                        "type": "string",
+                        "description": "Python code to execute and validate"
+                    },
+                    "description": {
+                        "type": "string",
+                        "description": "What this code is supposed to accomplish",
+                        "default": ""
+                    },
+                    "enable_quantum": {
+                        "type": "boolean", 
+                        "description": "Enable quantum debugging (test multiple variants)",
+                        "default": enable_quantum
+                    }
+                },
+                "required": ["code"]
+            }
+        ),
+        Tool(
+            name="optimize_code",
+            description="Automatically optimize code for performance, testing multiple approaches and recommending the best solution.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "code": {
+                        "type": "string",
+                        "description": "Code to optimize"
+                    },
+                    "optimization_focus": {
+                        "type": "string",
+                        "description": "Optimization focus: speed, memory, readability",
+                        "enum": ["speed", "memory", "readability", "auto"],
+                        "default": "auto"
+                    },
+                    "expected_behavior": {
+                        "type": "string",
+                        "description": "What the code should do (for validation)",
+                        "default": ""
+                    }
+                },
+                "required": ["code"]
+            }
+        ),
+        Tool(
+            name="validate_and_fix",
+            description="Comprehensive code validation with automatic bug detection and fixing suggestions.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "code": {
+                        "type": "string",
+                        "description": "Code to validate and potentially fix"
+                    },
+                    "test_edge_cases": {
+                        "type": "boolean",
+                        "description": "Test with edge cases and malformed inputs",
+                        "default": True
+                    }
+                },
+                "required": ["code"]
+            }
+        ),
+        Tool(
+            name="performance_analysis",
+            description="Detailed performance analysis with benchmarking and optimization recommendations.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "code": {
+                        "type": "string",
+                        "description": "Code to analyze for performance"
+                    },
+                    "benchmark_iterations": {
+                        "type": "integer",
+                        "description": "Number of benchmark iterations",
+                        "default": 100,
+                        "minimum": 1,
+                        "maximum": 10000
+                    }
+                },
+                "required": ["code"]
+            }
+        ),
+        Tool(
+            name="get_insights",
+            description="Get insights about coding patterns, learning progress, and personalized recommendations.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "analysis_type": {
+                        "type": "string",
+                        "description": "Type of analysis to perform",
+                        "enum": ["patterns", "progress", "recommendations", "all"],
+                        "default": "all"
+                    }
+                }
+            }
+        ),
+        Tool(
+            name="batch_execute",
+            description="Run several independent tool calls concurrently and return their results in order.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "operations": {
+                        "type": "array",
+                        "description": "Tool calls to run",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "tool": {"type": "string"},
+                                "arguments": {"type": "object", "default": {}}
+                            },
+                            "required": ["tool"]
+                        }
+                    },
+                    "maxConcurrent": {
+                        "type": "integer",
+                        "description": "Maximum number of operations running at once",
+                        "default": 4,
+                        "minimum": 1
+                    },
+                    "stopOnError": {
+                        "type": "boolean",
+                        "description": "Skip operations that haven't started once one fails",
+                        "default": False
+                    }
+                },
+                "required": ["operations"]
+            }
         )
+    )
 
 class ClaudeDesktopMCPServer:
     """Main MCP server for Claude Desktop code execution"""
     
+    __slots__ = (
+        "config", "server", "logger",
+        "executor", "quantum_debugger", "learning_system", "performance_monitor",
+        "execution_count", "start_time", "circuit_breaks",
+        "_log_handler", "_log_listener", "_log_stream_handler",
+        "_tool_handlers", "_failure_signatures", "_dashboard_task", "_exit_stack",
+    )
+    
     def __init__(self, config: Optional[ServerConfig] = None):
         self.config = config or ServerConfig.from_environment()
         self.server = Server("claude-code-execution")
+        self._dashboard_task: Optional[asyncio.Task] = None
         
         # Initialize components
         self._setup_logging()
         self._setup_components()
         self._register_tools()
         
+        # Recent failure signatures -> (error class, count, first failure time)
+        self._failure_signatures: "OrderedDict[Tuple[str, bytes], Tuple[str, int, float]]" = OrderedDict()
+        self.circuit_breaks = 0
+        
         # Execution tracking
         self.execution_count = 0
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
         
         self.logger.info("🚀 Claude Desktop MCP Server initialized")
     
     def _setup_logging(self):
         """Setup structured logging"""
+        # Log calls only enqueue records; a listener thread does the stderr
+        # writes so tool handlers never block on I/O in the event loop. The
+        # queue is bounded so a stalled sink sheds records instead of memory.
+        log_queue = queue.Queue(maxsize=self.config.log_queue_size)
+        
+        stream_handler = CoalescingStreamHandler(sys.stderr, log_queue)
+        if self.config.log_format == "json":
+            stream_handler.setFormatter(JsonLogFormatter())
+        else:
+            stream_handler.setFormatter(
+                logging.Formatter('%(asctime)s | %(levelname)s | %(name)s | %(message)s')
+            )
+        
+        self._log_stream_handler = stream_handler
+        self._log_listener = BoundedQueueListener(
+            log_queue, stream_handler, respect_handler_level=True
+        )
+        self._log_listener.start()
+        
+        self._log_handler = DroppingQueueHandler(log_queue)
         logging.basicConfig(
             level=getattr(logging, self.config.log_level),
-            format='%(asctime)s | %(levelname)s | %(name)s | %(message)s',
-            handlers=[logging.StreamHandler(sys.stderr)]
+            handlers=[self._log_handler]
         )
+        
+        # The server logger owns its handler directly, so its records skip the
+        # walk up to the root logger (which keeps handling SDK/library logs)
         self.logger = logging.getLogger("mcp_server")
+        for handler in list(self.logger.handlers):
+            self.logger.removeHandler(handler)
+        self.logger.addHandler(self._log_handler)
+        self.logger.setLevel(getattr(logging, self.config.log_level))
+        self.logger.propagate = False
+    
+    async def __aenter__(self) -> 'ClaudeDesktopMCPServer':
+        """Register teardown for everything the server owns"""
+        self._exit_stack = AsyncExitStack()
+        # Callbacks run in reverse: cancel background work, then flush logs
+        self._exit_stack.callback(self._log_stream_handler.flush)
+        self._exit_stack.callback(self._log_listener.stop)
+        self._exit_stack.callback(self._report_dropped_logs)
+        if self._dashboard_task is not None:
+            self._exit_stack.push_async_callback(self._stop_dashboard)
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._exit_stack.aclose()
+    
+    def _report_dropped_logs(self):
+        """Log how many records were shed because the log queue was full"""
+        if self._log_handler.dropped:
+            self.logger.warning("Dropped %d log records (log queue full)", self._log_handler.dropped)
+    
+    async def _stop_dashboard(self):
+        """Cancel the background dashboard task and wait for it to finish"""
+        self._dashboard_task.cancel()
+        await asyncio.gather(self._dashboard_task, return_exceptions=True)
     
     def _setup_components(self):
         """Initialize core components based on availability"""
@@ -117,7 +475,7 @@ class ClaudeDesktopMCPServer:
             if self.config.enable_monitoring:
                 self.performance_monitor = PerformanceMonitor()
                 # Start monitoring dashboard in background
-                asyncio.create_task(self._start_monitoring_dashboard())
+                self._dashboard_task = asyncio.create_task(self._start_monitoring_dashboard())
             else:
                 self.performance_monitor = None
                 
@@ -141,184 +499,147 @@ class ClaudeDesktopMCPServer:
     async def _start_monitoring_dashboard(self):
         """Start the monitoring dashboard in background"""
         try:
-            from monitoring.dashboard import start_dashboard
-            await start_dashboard(port=8888)
+            from monitoring.monitoring_dashboard import HAS_FASTAPI, start_dashboard
+            if not HAS_FASTAPI:
+                # start_dashboard would print this to stdout, which carries the MCP protocol
+                self.logger.warning("Monitoring dashboard requires FastAPI: pip install fastapi uvicorn")
+                return
+            # Serve the monitor this server records into, not a separate instance
+            await start_dashboard(port=8888, monitor=self.performance_monitor)
         except Exception as e:
-            self.logger.warning(f"Could not start monitoring dashboard: {e}")
+            self.logger.warning("Could not start monitoring dashboard: %s", e)
     
     def _register_tools(self):
         """Register MCP tools with the server"""
         
+        # Bound handlers resolved once, so dispatch is a single dict lookup
+        self._tool_handlers = {
+            "execute_code": self._handle_execute_code,
+            "optimize_code": self._handle_optimize_code,
+            "validate_and_fix": self._handle_validate_and_fix,
+            "performance_analysis": self._handle_performance_analysis,
+            "get_insights": self._handle_get_insights,
+            "batch_execute": self._handle_batch_execute
+        }
+        
         @self.server.list_tools()
         async def handle_list_tools() -> ListToolsResult:
             """List available tools"""
-            tools = [
-                Tool(
-                    name="execute_code",
-                    description="Execute Python code with real-time testing, optimization, and validation. Claude should use this BEFORE presenting any code to users to ensure it works correctly.",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "code": {
-                                "type": "string",
-                                "description": "Python code to execute and validate"
-                            },
-                            "description": {
-                                "type": "string",
-                                "description": "What this code is supposed to accomplish",
-                                "default": ""
-                            },
-                            "enable_quantum": {
-                                "type": "boolean", 
-                                "description": "Enable quantum debugging (test multiple variants)",
-                                "default": self.config.enable_quantum
-                            }
-                        },
-                        "required": ["code"]
-                    }
-                ),
-                Tool(
-                    name="optimize_code",
-                    description="Automatically optimize code for performance, testing multiple approaches and recommending the best solution.",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "code": {
-                                "type": "string",
-                                "description": "Code to optimize"
-                            },
-                            "optimization_focus": {
-                                "type": "string",
-                                "description": "Optimization focus: speed, memory, readability",
-                                "enum": ["speed", "memory", "readability", "auto"],
-                                "default": "auto"
-                            },
-                            "expected_behavior": {
-                                "type": "string",
-                                "description": "What the code should do (for validation)",
-                                "default": ""
-                            }
-                        },
-                        "required": ["code"]
-                    }
-                ),
-                Tool(
-                    name="validate_and_fix",
-                    description="Comprehensive code validation with automatic bug detection and fixing suggestions.",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "code": {
-                                "type": "string",
-                                "description": "Code to validate and potentially fix"
-                            },
-                            "test_edge_cases": {
-                                "type": "boolean",
-                                "description": "Test with edge cases and malformed inputs",
-                                "default": True
-                            }
-                        },
-                        "required": ["code"]
-                    }
-                ),
-                Tool(
-                    name="performance_analysis",
-                    description="Detailed performance analysis with benchmarking and optimization recommendations.",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "code": {
-                                "type": "string",
-                                "description": "Code to analyze for performance"
-                            },
-                            "benchmark_iterations": {
-                                "type": "integer",
-                                "description": "Number of benchmark iterations",
-                                "default": 100,
-                                "minimum": 1,
-                                "maximum": 10000
-                            }
-                        },
-                        "required": ["code"]
-                    }
-                ),
-                Tool(
-                    name="get_insights",
-                    description="Get insights about coding patterns, learning progress, and personalized recommendations.",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "analysis_type": {
-                                "type": "string",
-                                "description": "Type of analysis to perform",
-                                "enum": ["patterns", "progress", "recommendations", "all"],
-                                "default": "all"
-                            }
-                        }
-                    }
-                )
-            ]
-            
-            return ListToolsResult(tools=tools)
+            return ListToolsResult(tools=list(_build_tools(self.config.enable_quantum)))
         
         @self.server.call_tool()
         async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> CallToolResult:
             """Handle tool calls with comprehensive error handling"""
+            return await self._call_tool(name, arguments)
+    
+    async def _call_tool(self, name: str, arguments: Dict[str, Any]) -> CallToolResult:
+        """Run a single tool call with logging, monitoring and error handling"""
+        
+        request_id = f"{name}_{self.execution_count}"
+        self.execution_count += 1
+        
+        start_time = time.perf_counter()
+        self.logger.info("🔧 Tool call: %s (ID: %s)", name, request_id,
+                         extra={"tool": name, "request_id": request_id})
+        
+        signature = self._failure_signature(name, arguments)
+        
+        try:
+            result = self._check_circuit(signature)
+            if result is None:
+                result = await self._dispatch_tool(name, arguments, request_id)
+                # Error results are static validation failures, which don't run
+                # anything and so don't count towards the circuit breaker
+                if not result.isError:
+                    self._failure_signatures.pop(signature, None)
             
-            request_id = f"{name}_{self.execution_count}"
-            self.execution_count += 1
+            execution_time = (time.perf_counter() - start_time) * 1000
+            self.logger.info("✅ Tool %s completed in %.2fms", name, execution_time,
+                             extra={"tool": name, "request_id": request_id, "duration_ms": execution_time})
             
-            start_time = time.time()
-            self.logger.info(f"🔧 Tool call: {name} (ID: {request_id})")
+            # Track performance if monitoring is enabled
+            if self.performance_monitor:
+                await self.performance_monitor.record_execution(
+                    tool_name=name,
+                    execution_time_ms=execution_time,
+                    success=not result.isError,
+                    request_id=request_id
+                )
             
-            try:
-                if name == "execute_code":
-                    result = await self._handle_execute_code(arguments, request_id)
-                elif name == "optimize_code":
-                    result = await self._handle_optimize_code(arguments, request_id)
-                elif name == "validate_and_fix":
-                    result = await self._handle_validate_and_fix(arguments, request_id)
-                elif name == "performance_analysis":
-                    result = await self._handle_performance_analysis(arguments, request_id)
-                elif name == "get_insights":
-                    result = await self._handle_get_insights(arguments, request_id)
-                else:
-                    raise ValueError(f"Unknown tool: {name}")
-                
-                execution_time = (time.time() - start_time) * 1000
-                self.logger.info(f"✅ Tool {name} completed in {execution_time:.2f}ms")
-                
-                # Track performance if monitoring is enabled
-                if self.performance_monitor:
-                    await self.performance_monitor.record_execution(
-                        tool_name=name,
-                        execution_time_ms=execution_time,
-                        success=True,
-                        request_id=request_id
-                    )
-                
-                return result
-                
-            except Exception as e:
-                execution_time = (time.time() - start_time) * 1000
-                self.logger.error(f"❌ Tool {name} failed: {e}")
-                
-                if self.performance_monitor:
-                    await self.performance_monitor.record_execution(
-                        tool_name=name,
-                        execution_time_ms=execution_time,
-                        success=False,
-                        error=str(e),
-                        request_id=request_id
-                    )
-                
-                return CallToolResult(
-                    content=[TextContent(
-                        type="text",
-                        text=f"❌ **Tool Execution Failed**\n\n**Tool:** {name}\n**Error:** {str(e)}\n\n*The execution environment encountered an error. Please try again or contact support if the issue persists.*"
-                    )],
-                    isError=True
+            return result
+            
+        except Exception as e:
+            self._record_failure(signature, type(e).__name__)
+            execution_time = (time.perf_counter() - start_time) * 1000
+            self.logger.error("❌ Tool %s failed: %s", name, e,
+                              extra={"tool": name, "request_id": request_id, "duration_ms": execution_time})
+            
+            if self.performance_monitor:
+                await self.performance_monitor.record_execution(
+                    tool_name=name,
+                    execution_time_ms=execution_time,
+                    success=False,
+                    error=str(e),
+                    request_id=request_id
                 )
+            
+            return CallToolResult(
+                content=[TextContent(
+                    type="text",
+                    text=f"❌ **Tool Execution Failed**\n\n**Tool:** {name}\n**Error:** {str(e)}\n\n*The execution environment encountered an error. Please try again or contact support if the issue persists.*"
+                )],
+                isError=True
+            )
+    
+    def _failure_signature(self, name: str, arguments: Dict[str, Any]) -> Optional[Tuple[str, bytes]]:
+        """Identify a call by tool and its full arguments so repeated failures can be spotted"""
+        if not isinstance(arguments, dict):
+            return None
+        # Key order doesn't change the call, so normalize it away
+        normalized = json.dumps(arguments, sort_keys=True, separators=(",", ":"), default=str)
+        return name, hashlib.blake2b(normalized.encode(), digest_size=8).digest()
+    
+    def _check_circuit(self, signature: Optional[Tuple[str, bytes]]) -> Optional[CallToolResult]:
+        """Return a canned error if this exact call keeps failing, else None"""
+        entry = self._failure_signatures.get(signature) if signature else None
+        if entry is None:
+            return None
+        
+        error_class, count, first_failure = entry
+        if time.monotonic() - first_failure > CIRCUIT_WINDOW_SECONDS:
+            # Window expired; give the call a fresh chance
+            del self._failure_signatures[signature]
+            return None
+        if count < CIRCUIT_FAILURE_THRESHOLD:
+            return None
+        
+        self.circuit_breaks += 1
+        self.logger.warning("Circuit open for %s after %d identical failures", signature[0], count)
+        return CallToolResult(
+            content=[TextContent(
+                type="text",
+                text=f"🛑 **Repeated Failure Detected**\n\nThis exact `{signature[0]}` call has failed {count} times in the last {CIRCUIT_WINDOW_SECONDS:.0f}s ({error_class}). It was not run again; change the code or arguments before retrying."
+            )],
+            isError=True
+        )
+    
+    def _record_failure(self, signature: Optional[Tuple[str, bytes]], error_class: str):
+        """Count a failure for the circuit breaker, evicting the oldest signatures"""
+        if signature is None:
+            return
+        
+        _, count, first_failure = self._failure_signatures.get(signature, (error_class, 0, time.monotonic()))
+        self._failure_signatures[signature] = (error_class, count + 1, first_failure)
+        self._failure_signatures.move_to_end(signature)
+        if len(self._failure_signatures) > CIRCUIT_MAX_SIGNATURES:
+            self._failure_signatures.popitem(last=False)
+    
+    async def _dispatch_tool(self, name: str, arguments: Dict[str, Any], request_id: str) -> CallToolResult:
+        """Route a tool call to its handler"""
+        handler = self._tool_handlers.get(name)
+        if handler is None:
+            raise ValueError(f"Unknown tool: {name}")
+        return await handler(arguments, request_id)
     
     async def _handle_execute_code(self, args: Dict[str, Any], request_id: str) -> CallToolResult:
         """Handle code execution requests"""
@@ -327,10 +648,7 @@ class ClaudeDesktopMCPServer:
         enable_quantum = args.get("enable_quantum", self.config.enable_quantum)
         
         if not code:
-            return CallToolResult(
-                content=[TextContent(type="text", text="❌ No code provided to execute")],
-                isError=True
-            )
+            return _static_error("❌ No code provided to execute")
         
         # Execute with quantum debugging if enabled and available
         if enable_quantum and self.quantum_debugger:
@@ -353,10 +671,7 @@ class ClaudeDesktopMCPServer:
         expected_behavior = args.get("expected_behavior", "")
         
         if not code:
-            return CallToolResult(
-                content=[TextContent(type="text", text="❌ No code provided to optimize")],
-                isError=True
-            )
+            return _static_error("❌ No code provided to optimize")
         
         if self.quantum_debugger:
             # Use quantum debugging for optimization
@@ -376,10 +691,7 @@ class ClaudeDesktopMCPServer:
         test_edge_cases = args.get("test_edge_cases", True)
         
         if not code:
-            return CallToolResult(
-                content=[TextContent(type="text", text="❌ No code provided to validate")],
-                isError=True
-            )
+            return _static_error("❌ No code provided to validate")
         
         # Comprehensive validation
         validation_result = await self._comprehensive_validation(code, test_edge_cases)
@@ -393,10 +705,7 @@ class ClaudeDesktopMCPServer:
         iterations = args.get("benchmark_iterations", 100)
         
         if not code:
-            return CallToolResult(
-                content=[TextContent(type="text", text="❌ No code provided to analyze")],
-                isError=True
-            )
+            return _static_error("❌ No code provided to analyze")
         
         # Performance benchmarking
         analysis_result = await self._performance_benchmarking(code, iterations)
@@ -414,11 +723,81 @@ class ClaudeDesktopMCPServer:
         else:
             response = "📊 **Insights Feature**\n\nLearning system is not enabled. To get personalized insights, enable the learning system in your configuration.\n\n**Current Status:**\n- Executions this session: {}\n- Uptime: {:.1f} minutes".format(
                 self.execution_count,
-                (time.time() - self.start_time) / 60
+                (time.monotonic() - self.start_time) / 60
             )
         
         return CallToolResult(content=[TextContent(type="text", text=response)])
     
+    async def _handle_batch_execute(self, args: Dict[str, Any], request_id: str) -> CallToolResult:
+        """Handle batched tool calls, running independent operations concurrently"""
+        operations = args.get("operations", [])
+        max_concurrent = max(1, int(args.get("maxConcurrent", 4)))
+        stop_on_error = args.get("stopOnError", False)
+        
+        if not operations:
+            return _static_error("❌ No operations provided to batch")
+        if not isinstance(operations, list):
+            return _static_error("❌ Batch operations must be a list")
+        
+        semaphore = asyncio.Semaphore(max_concurrent)
+        stopped = asyncio.Event()
+        
+        async def run_operation(operation: Dict[str, Any]) -> Optional[CallToolResult]:
+            async with semaphore:
+                if stopped.is_set():
+                    return None
+                
+                problem = _batch_operation_error(operation)
+                if problem is not None:
+                    result = _static_error(f"❌ {problem}")
+                else:
+                    result = await self._call_tool(operation["tool"], operation.get("arguments", {}))
+                
+                if result.isError and stop_on_error:
+                    stopped.set()
+                return result
+        
+        # Results come back in input order regardless of completion order
+        results = await self._gather_subtasks([run_operation(op) for op in operations])
+        
+        content = []
+        for index, (operation, result) in enumerate(zip(operations, results), 1):
+            tool = operation.get("tool", "") if isinstance(operation, dict) else ""
+            header = f"**Operation {index}: {tool}**"
+            if result is None:
+                content.append(TextContent(type="text", text=f"{header}\n\n⏭️ Skipped after an earlier failure"))
+            else:
+                content.append(TextContent(type="text", text=header))
+                content.extend(result.content)
+        
+        return CallToolResult(
+            content=content,
+            isError=any(result is None or result.isError for result in results)
+        )
+    
+    async def _gather_subtasks(self, coros: List[Any]) -> List[Any]:
+        """Run sub-operations concurrently; if one raises, cancel the rest and re-raise it"""
+        if hasattr(asyncio, "TaskGroup"):  # Python 3.11+
+            try:
+                async with asyncio.TaskGroup() as group:
+                    tasks = [group.create_task(coro) for coro in coros]
+            except BaseException as e:
+                # Surface the first failure the way gather would, not an ExceptionGroup
+                exceptions = getattr(e, "exceptions", None)
+                if exceptions:
+                    raise exceptions[0]
+                raise
+            return [task.result() for task in tasks]
+        
+        tasks = [asyncio.ensure_future(coro) for coro in coros]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+    
     def _format_execution_result(self, result: ExecutionResult, description: str) -> str:
         """Format execution result for Claude"""
         status_emoji = "✅" if result.status == ExecutionStatus.SUCCESS else "❌"
@@ -529,22 +908,20 @@ class ClaudeDesktopMCPServer:
     
     async def _comprehensive_validation(self, code: str, test_edge_cases: bool) -> Dict[str, Any]:
         """Perform comprehensive code validation"""
-        # Basic execution
-        basic_result = await self.executor.execute_code(code)
+        # Basic execution, plus edge case testing if requested; both are
+        # independent runs of the same code, so do them concurrently
+        subtasks = [self.executor.execute_code(code)]
+        if test_edge_cases and self.quantum_debugger:
+            subtasks.append(self.quantum_debugger.generate_edge_case_tests(code))
         
-        validation_result = {
+        basic_result, *edge_cases = await self._gather_subtasks(subtasks)
+        
+        return {
             "basic_execution": basic_result,
-            "edge_case_tests": [],
+            "edge_case_tests": edge_cases[0] if edge_cases else [],
             "security_check": None,
             "syntax_analysis": None
         }
-        
-        # Edge case testing if requested
-        if test_edge_cases and self.quantum_debugger:
-            edge_cases = await self.quantum_debugger.generate_edge_case_tests(code)
-            validation_result["edge_case_tests"] = edge_cases
-        
-        return validation_result
     
     def _format_validation_result(self, validation_result: Dict[str, Any]) -> str:
         """Format validation result"""
@@ -586,7 +963,7 @@ class ClaudeDesktopMCPServer:
                 results.append(result.execution_time_ms)
         
         if results:
-            avg_time = sum(results) / len(results)
+            avg_time = fmean(results)
             min_time = min(results)
             max_time = max(results)
             
@@ -622,7 +999,15 @@ class ClaudeDesktopMCPServer:
     
     def _format_insights(self, insights: Dict[str, Any], analysis_type: str) -> str:
         """Format learning insights"""
-        return f"🧠 **AI Learning Insights**\n\n**Analysis Type:** {analysis_type.title()}\n\n" + json.dumps(insights, indent=2)
+        header = f"🧠 **AI Learning Insights**\n\n**Analysis Type:** {analysis_type.title()}\n\n"
+        if HAS_ORJSON:
+            try:
+                return header + orjson.dumps(
+                    insights, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+                ).decode()
+            except TypeError:
+                pass  # Fall back to the stdlib encoder for types orjson rejects
+        return header + json.dumps(insights, indent=2)
     
     async def run(self):
         """Run the MCP server"""
@@ -636,20 +1021,24 @@ class ClaudeDesktopMCPServer:
             async with stdio_server() as (read_stream, write_stream):
                 await self.server.run(read_stream, write_stream)
         except Exception as e:
-            self.logger.critical(f"💥 Server failed: {e}")
+            self.logger.critical("💥 Server failed: %s", e)
             raise
 
 async def main():
     """Main entry point"""
     try:
         config = ServerConfig.from_environment()
-        server = ClaudeDesktopMCPServer(config)
-        await server.run()
+        async with ClaudeDesktopMCPServer(config) as server:
+            await server.run()
     except KeyboardInterrupt:
         print("\n✅ Server stopped by user", file=sys.stderr)
     except Exception as e:
         print(f"\n💥 Fatal error: {e}", file=sys.stderr)
         sys.exit(1)
 
+def run_server():
+    """Run main() on uvloop when it is installed, else on the default loop"""
+    run(main())
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_server()
@@ -5,21 +5,25 @@ Provides web-based monitoring and insights for Claude MCP code execution
 """
 
 import asyncio
+import heapq
 import json
+import sys
 import time
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from dataclasses import dataclass, field
 import webbrowser
 from collections import defaultdict, deque
+from operator import itemgetter
 
 try:
     from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request
     from fastapi.staticfiles import StaticFiles
     from fastapi.templating import Jinja2Templates
-    from fastapi.responses import HTMLResponse, JSONResponse
+    from fastapi.responses import HTMLResponse, JSONResponse, Response
+    from starlette.middleware.gzip import GZipMiddleware
     import uvicorn
     HAS_FASTAPI = True
 except ImportError:
@@ -33,19 +37,52 @@ try:
 except ImportError:
     HAS_PLOTLY = False
 
-@dataclass
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Let Plotly serialize figure data with orjson instead of its pure-Python encoder
+if HAS_PLOTLY and HAS_ORJSON:
+    import plotly.io as pio
+    pio.json.config.default_engine = "orjson"
+
+# plotly.js matching the installed plotly package; deferred like dashboard.js,
+# which runs after it because deferred scripts keep document order
+if HAS_PLOTLY:
+    from plotly.offline import get_plotlyjs_version
+    PLOTLY_SCRIPT_TAG = f'<script src="https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js" defer></script>'
+else:
+    PLOTLY_SCRIPT_TAG = ""
+
+def _dumps_bytes(obj: Any) -> bytes:
+    """Serialize to UTF-8 JSON bytes, using orjson when available"""
+    if HAS_ORJSON:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+# Slotted dataclasses need Python 3.10+; older interpreters keep the __dict__ layout
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_DATACLASS_SLOTS)
 class ExecutionMetric:
     """Single execution metric data point"""
-    timestamp: datetime
+    timestamp: float  # Unix epoch seconds
     tool_name: str
     execution_time_ms: float
     success: bool
     error: Optional[str] = None
     request_id: Optional[str] = None
+    # ISO form of timestamp, formatted once rather than per serialization
+    ts_iso: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.ts_iso = datetime.fromtimestamp(self.timestamp).isoformat()
     
     def to_dict(self) -> Dict[str, Any]:
         return {
-            "timestamp": self.timestamp.isoformat(),
+            "timestamp": self.ts_iso,
             "tool_name": self.tool_name,
             "execution_time_ms": self.execution_time_ms,
             "success": self.success,
@@ -53,17 +90,34 @@ class ExecutionMetric:
             "request_id": self.request_id
         }
 
+# Seconds metric updates are collected before being broadcast as one batch
+BROADCAST_INTERVAL = 0.05
+
+# Time series granularity and how long buckets are kept, in seconds
+BUCKET_SECONDS = 5 * 60
+BUCKET_RETENTION_SECONDS = 24 * 60 * 60
+
 class MetricsCollector:
     """Collects and aggregates execution metrics"""
     
     def __init__(self, max_history: int = 1000):
         self.max_history = max_history
         self.metrics_history = deque(maxlen=max_history)
+        
+        # Running total of execution times in metrics_history, and monotonic
+        # timestamps of the last minute's executions, so updates stay O(1)
+        self._time_sum = 0.0
+        self._recent_times: deque = deque()
+        
+        # 5-minute bucket start (epoch seconds) -> [time sum, count, successes], in
+        # insertion (chronological) order; buckets older than the retention are evicted
+        self._buckets: Dict[float, List[float]] = {}
         self.real_time_metrics = {
             "total_executions": 0,
             "successful_executions": 0,
             "failed_executions": 0,
             "average_execution_time": 0.0,
+            "success_rate": 0.0,
             "requests_per_minute": 0,
             "current_session_start": datetime.now(),
             "tool_usage": defaultdict(int),
@@ -71,7 +125,11 @@ class MetricsCollector:
         }
         
         # WebSocket connections for real-time updates
-        self.websocket_connections: List[WebSocket] = []
+        self.websocket_connections: Set[WebSocket] = set()
+        
+        # Metrics waiting for the next coalesced broadcast, and the task that will send them
+        self._pending_updates: List[Dict[str, Any]] = []
+        self._flush_task: Optional[asyncio.Task] = None
     
     async def record_execution(
         self, 
@@ -84,7 +142,7 @@ class MetricsCollector:
         """Record a new execution metric"""
         
         metric = ExecutionMetric(
-            timestamp=datetime.now(),
+            timestamp=time.time(),
             tool_name=tool_name,
             execution_time_ms=execution_time_ms,
             success=success,
@@ -92,7 +150,11 @@ class MetricsCollector:
             request_id=request_id
         )
         
+        if len(self.metrics_history) == self.max_history:
+            self._time_sum -= self.metrics_history[0].execution_time_ms
         self.metrics_history.append(metric)
+        self._time_sum += execution_time_ms
+        self._add_to_bucket(metric)
         
         # Update real-time metrics
         self.real_time_metrics["total_executions"] += 1
@@ -107,94 +169,114 @@ class MetricsCollector:
                 error_type = error.split(":")[0] if ":" in error else "Unknown"
                 self.real_time_metrics["error_patterns"][error_type] += 1
         
+        # Total was just incremented, so it is never zero here
+        self.real_time_metrics["success_rate"] = (
+            100.0 * self.real_time_metrics["successful_executions"] / self.real_time_metrics["total_executions"]
+        )
+        
         # Update average execution time
-        total_time = sum(m.execution_time_ms for m in self.metrics_history)
-        self.real_time_metrics["average_execution_time"] = total_time / len(self.metrics_history)
+        self.real_time_metrics["average_execution_time"] = self._time_sum / len(self.metrics_history)
         
         # Calculate requests per minute
-        now = datetime.now()
-        one_minute_ago = now - timedelta(minutes=1)
-        recent_requests = sum(1 for m in self.metrics_history if m.timestamp > one_minute_ago)
-        self.real_time_metrics["requests_per_minute"] = recent_requests
-        
-        # Broadcast to WebSocket clients
-        await self._broadcast_update(metric)
+        now = time.monotonic()
+        one_minute_ago = now - 60
+        self._recent_times.append(now)
+        while self._recent_times[0] <= one_minute_ago:
+            self._recent_times.popleft()
+        self.real_time_metrics["requests_per_minute"] = len(self._recent_times)
+        
+        # Queue for WebSocket clients; bursts go out as one batched message
+        if self.websocket_connections:
+            self._pending_updates.append(metric.to_dict())
+            if self._flush_task is None:
+                self._flush_task = asyncio.get_running_loop().create_task(self._flush_after_interval())
+    
+    async def _flush_after_interval(self):
+        """Wait for more updates to accumulate, then broadcast them together"""
+        try:
+            await asyncio.sleep(BROADCAST_INTERVAL)
+        finally:
+            self._flush_task = None
+        await self.flush_updates()
     
-    async def _broadcast_update(self, metric: ExecutionMetric):
-        """Broadcast metric update to all connected WebSocket clients"""
-        if not self.websocket_connections:
+    async def flush_updates(self):
+        """Broadcast all pending metric updates to connected WebSocket clients now"""
+        metrics, self._pending_updates = self._pending_updates, []
+        if not metrics or not self.websocket_connections:
             return
         
-        message = {
-            "type": "execution_update",
-            "data": metric.to_dict(),
+        # Encode once as bytes; every client gets the same binary frame
+        payload = _dumps_bytes({
+            "type": "batch",
+            "metrics": metrics,
             "summary": self.get_summary_stats()
-        }
-        
-        # Send to all connected clients
-        disconnected = []
-        for websocket in self.websocket_connections:
-            try:
-                await websocket.send_text(json.dumps(message))
-            except:
-                disconnected.append(websocket)
+        })
+        
+        # Send to all connected clients concurrently, so one slow socket
+        # doesn't hold up the rest
+        websockets = list(self.websocket_connections)
+        results = await asyncio.gather(
+            *(websocket.send_bytes(payload) for websocket in websockets),
+            return_exceptions=True
+        )
         
         # Remove disconnected clients
-        for ws in disconnected:
-            self.websocket_connections.remove(ws)
+        self.websocket_connections -= {
+            ws for ws, result in zip(websockets, results) if isinstance(result, Exception)
+        }
     
     def get_summary_stats(self) -> Dict[str, Any]:
         """Get summary statistics"""
         return {
             "total_executions": self.real_time_metrics["total_executions"],
-            "success_rate": (
-                self.real_time_metrics["successful_executions"] / 
-                max(self.real_time_metrics["total_executions"], 1)
-            ) * 100,
+            "success_rate": self.real_time_metrics["success_rate"],
             "average_execution_time": round(self.real_time_metrics["average_execution_time"], 2),
             "requests_per_minute": self.real_time_metrics["requests_per_minute"],
             "session_duration": str(datetime.now() - self.real_time_metrics["current_session_start"]).split('.')[0],
-            "top_tools": dict(sorted(
-                self.real_time_metrics["tool_usage"].items(), 
-                key=lambda x: x[1], 
-                reverse=True
-            )[:5]),
-            "recent_errors": dict(sorted(
-                self.real_time_metrics["error_patterns"].items(), 
-                key=lambda x: x[1], 
-                reverse=True
-            )[:3])
+            "top_tools": dict(heapq.nlargest(
+                5, self.real_time_metrics["tool_usage"].items(), key=itemgetter(1)
+            )),
+            "recent_errors": dict(heapq.nlargest(
+                3, self.real_time_metrics["error_patterns"].items(), key=itemgetter(1)
+            ))
         }
     
+    def _add_to_bucket(self, metric: ExecutionMetric):
+        """Fold a metric into its 5-minute time series bucket"""
+        key = metric.timestamp - metric.timestamp % BUCKET_SECONDS
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [0.0, 0, 0]
+            self._evict_buckets(key - BUCKET_RETENTION_SECONDS)
+        bucket[0] += metric.execution_time_ms
+        bucket[1] += 1
+        if metric.success:
+            bucket[2] += 1
+    
+    def _evict_buckets(self, cutoff: float):
+        """Drop buckets that start before the cutoff (oldest come first)"""
+        while self._buckets:
+            oldest = next(iter(self._buckets))
+            if oldest >= cutoff:
+                break
+            del self._buckets[oldest]
+    
     def get_time_series_data(self, hours: int = 24) -> Dict[str, Any]:
         """Get time series data for charts"""
-        cutoff_time = datetime.now() - timedelta(hours=hours)
-        recent_metrics = [m for m in self.metrics_history if m.timestamp > cutoff_time]
-        
-        if not recent_metrics:
-            return {"timestamps": [], "execution_times": [], "success_rates": []}
+        # A bucket is included if any part of its interval falls after the cutoff
+        cutoff_time = time.time() - hours * 3600 - BUCKET_SECONDS
         
-        # Group by 5-minute intervals
-        interval_data = defaultdict(lambda: {"times": [], "successes": 0, "total": 0})
-        
-        for metric in recent_metrics:
-            # Round to 5-minute intervals
-            interval_key = metric.timestamp.replace(minute=(metric.timestamp.minute // 5) * 5, second=0, microsecond=0)
-            interval_data[interval_key]["times"].append(metric.execution_time_ms)
-            interval_data[interval_key]["total"] += 1
-            if metric.success:
-                interval_data[interval_key]["successes"] += 1
-        
-        # Convert to chart data
         timestamps = []
         execution_times = []
         success_rates = []
         
-        for timestamp in sorted(interval_data.keys()):
-            data = interval_data[timestamp]
-            timestamps.append(timestamp.isoformat())
-            execution_times.append(sum(data["times"]) / len(data["times"]) if data["times"] else 0)
-            success_rates.append((data["successes"] / data["total"]) * 100 if data["total"] > 0 else 0)
+        for timestamp in sorted(self._buckets):
+            if timestamp <= cutoff_time:
+                continue
+            time_sum, total, successes = self._buckets[timestamp]
+            timestamps.append(datetime.fromtimestamp(timestamp).isoformat())
+            execution_times.append(time_sum / total)
+            success_rates.append((successes / total) * 100)
         
         return {
             "timestamps": timestamps,
@@ -202,17 +284,137 @@ class MetricsCollector:
             "success_rates": success_rates
         }
 
+# Dashboard stylesheet and script, served under /static
+STATIC_DIR = Path(__file__).parent / "static"
+
+# Dashboard page; CSS and JS live in STATIC_DIR
+DASHBOARD_TEMPLATE = """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Claude MCP Execution Dashboard</title>
+    <link rel="stylesheet" href="/static/dashboard.css">
+    {plotly_script}
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>
+                🃏 Claude MCP Code Execution Dashboard
+                <span class="status-indicator status-online" id="connection-status"></span>
+                <span id="connection-text">Connected</span>
+            </h1>
+            <p>Real-time monitoring and analytics for AI-assisted programming</p>
+            <p><strong>Session Duration:</strong> {session_duration}</p>
+        </div>
+        
+        <div class="stats-grid">
+            <div class="stat-card">
+                <div class="stat-value total-executions">{total_executions}</div>
+                <div class="stat-label">Total Executions</div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-value success-rate">{success_rate:.1f}%</div>
+                <div class="stat-label">Success Rate</div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-value execution-time">{average_execution_time:.0f}ms</div>
+                <div class="stat-label">Avg Execution Time</div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-value requests-per-minute">{requests_per_minute}</div>
+                <div class="stat-label">Requests/Minute</div>
+            </div>
+        </div>
+        
+        <div class="charts-grid">
+            <div class="chart-container">
+                <div id="performance-chart">Loading chart...</div>
+            </div>
+            <div class="chart-container">
+                <div id="tool-usage-chart">Loading chart...</div>
+            </div>
+        </div>
+        
+        <div class="real-time-log">
+            <h3>🔴 Real-time Execution Log</h3>
+            <div id="log-container">
+                <div class="log-entry log-info">Dashboard started - waiting for executions...</div>
+            </div>
+        </div>
+    </div>
+    
+    <script src="/static/dashboard.js" defer></script>
+</body>
+</html>
+"""
+
+# Seconds between websocket ping frames sent by the server
+WEBSOCKET_PING_INTERVAL = 30.0
+
+# Seconds a rendered dashboard page is reused while no new executions arrive
+DASHBOARD_CACHE_TTL = 2.0
+
 class DashboardGenerator:
     """Generates dashboard HTML and charts"""
     
     def __init__(self, metrics_collector: MetricsCollector):
         self.metrics_collector = metrics_collector
-    
-    def generate_performance_chart(self) -> str:
-        """Generate performance chart using Plotly"""
-        if not HAS_PLOTLY:
-            return "<div>Charts require plotly installation</div>"
+        # (data version, monotonic render time, html) of the last page served
+        self._html_cache: Optional[Tuple[Tuple[int, int], float, str]] = None
+        # Chart name -> (data version, html)
+        self._chart_cache: Dict[str, Tuple[Tuple[int, int], str]] = {}
+        
+        # Chart name -> figure builder, used by the JSON endpoint
+        self._chart_builders: Dict[str, Callable[[], Any]] = {
+            "performance": self._performance_figure,
+            "tool_usage": self._tool_usage_figure,
+        }
         
+        # Decide once whether charts can be rendered, so the render paths don't branch
+        if HAS_PLOTLY:
+            self.generate_performance_chart = self._plotly_performance_chart
+            self.generate_tool_usage_chart = self._plotly_tool_usage_chart
+            self._render_chart_json = self._plotly_chart_json
+        else:
+            self.generate_performance_chart = self._plotly_missing_chart
+            self.generate_tool_usage_chart = self._plotly_missing_chart
+            self._render_chart_json = self._plotly_missing_chart_json
+    
+    def _data_version(self) -> Tuple[int, int]:
+        """Key that changes whenever a new execution is recorded"""
+        return (
+            self.metrics_collector.real_time_metrics["total_executions"],
+            len(self.metrics_collector.metrics_history)
+        )
+    
+    def _cached_chart(self, name: str, render: Callable[[], str]) -> str:
+        """Render a chart only when the underlying data has changed"""
+        version = self._data_version()
+        cached = self._chart_cache.get(name)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        html = render()
+        self._chart_cache[name] = (version, html)
+        return html
+    
+    def get_dashboard_html(self) -> str:
+        """Return the dashboard page, reusing a recent render if nothing changed"""
+        version = self._data_version()
+        now = time.monotonic()
+        if self._html_cache is not None:
+            cached_version, rendered_at, html = self._html_cache
+            if cached_version == version and now - rendered_at < DASHBOARD_CACHE_TTL:
+                return html
+        
+        html = self.generate_dashboard_html()
+        self._html_cache = (version, now, html)
+        return html
+    
+    def _performance_figure(self) -> "go.Figure":
+        """Build the performance-over-time figure"""
         time_series = self.metrics_collector.get_time_series_data()
         
         fig = go.Figure()
@@ -255,17 +457,14 @@ class DashboardGenerator:
             template='plotly_white'
         )
         
-        return fig.to_html(include_plotlyjs='cdn', div_id='performance-chart')
+        return fig
     
-    def generate_tool_usage_chart(self) -> str:
-        """Generate tool usage pie chart"""
-        if not HAS_PLOTLY:
-            return "<div>Charts require plotly installation</div>"
-        
+    def _tool_usage_figure(self) -> Optional["go.Figure"]:
+        """Build the tool usage pie chart, or None before any executions"""
         tool_usage = self.metrics_collector.real_time_metrics["tool_usage"]
         
         if not tool_usage:
-            return "<div>No tool usage data available yet</div>"
+            return None
         
         fig = go.Figure(data=[go.Pie(
             labels=list(tool_usage.keys()),
@@ -278,242 +477,62 @@ class DashboardGenerator:
             template='plotly_white'
         )
         
-        return fig.to_html(include_plotlyjs='cdn', div_id='tool-usage-chart')
+        return fig
     
-    def generate_dashboard_html(self) -> str:
-        """Generate complete dashboard HTML"""
-        stats = self.metrics_collector.get_summary_stats()
-        
-        html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Claude MCP Execution Dashboard</title>
-    <style>
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            margin: 0;
-            padding: 20px;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: #333;
-            min-height: 100vh;
-        }}
-        .container {{
-            max-width: 1400px;
-            margin: 0 auto;
-        }}
-        .header {{
-            background: rgba(255, 255, 255, 0.95);
-            padding: 30px;
-            border-radius: 15px;
-            margin-bottom: 30px;
-            backdrop-filter: blur(10px);
-            box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
-        }}
-        .stats-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-            gap: 20px;
-            margin-bottom: 30px;
-        }}
-        .stat-card {{
-            background: rgba(255, 255, 255, 0.95);
-            border-radius: 15px;
-            padding: 25px;
-            text-align: center;
-            backdrop-filter: blur(10px);
-            box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
-            transition: transform 0.3s ease;
-        }}
-        .stat-card:hover {{
-            transform: translateY(-5px);
-        }}
-        .stat-value {{
-            font-size: 2.5em;
-            font-weight: bold;
-            margin-bottom: 10px;
-        }}
-        .stat-label {{
-            color: #666;
-            font-size: 0.9em;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-        }}
-        .success-rate {{ color: #4caf50; }}
-        .execution-time {{ color: #2196f3; }}
-        .total-executions {{ color: #ff9800; }}
-        .requests-per-minute {{ color: #9c27b0; }}
-        
-        .charts-grid {{
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 30px;
-            margin-bottom: 30px;
-        }}
-        .chart-container {{
-            background: rgba(255, 255, 255, 0.95);
-            border-radius: 15px;
-            padding: 20px;
-            backdrop-filter: blur(10px);
-            box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
-        }}
-        .status-indicator {{
-            display: inline-block;
-            width: 12px;
-            height: 12px;
-            border-radius: 50%;
-            margin-right: 8px;
-        }}
-        .status-online {{ background-color: #4caf50; }}
-        .status-offline {{ background-color: #f44336; }}
-        
-        .real-time-log {{
-            background: rgba(255, 255, 255, 0.95);
-            border-radius: 15px;
-            padding: 20px;
-            backdrop-filter: blur(10px);
-            box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1);
-            max-height: 400px;
-            overflow-y: auto;
-        }}
-        .log-entry {{
-            padding: 8px 12px;
-            margin: 5px 0;
-            border-radius: 8px;
-            font-family: 'Monaco', 'Consolas', monospace;
-            font-size: 0.85em;
-        }}
-        .log-success {{ background: #e8f5e8; border-left: 3px solid #4caf50; }}
-        .log-error {{ background: #ffeaea; border-left: 3px solid #f44336; }}
-        .log-info {{ background: #e3f2fd; border-left: 3px solid #2196f3; }}
-        
-        @media (max-width: 768px) {{
-            .charts-grid {{
-                grid-template-columns: 1fr;
-            }}
-            .stats-grid {{
-                grid-template-columns: repeat(2, 1fr);
-            }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>
-                🃏 Claude MCP Code Execution Dashboard
-                <span class="status-indicator status-online" id="connection-status"></span>
-                <span id="connection-text">Connected</span>
-            </h1>
-            <p>Real-time monitoring and analytics for AI-assisted programming</p>
-            <p><strong>Session Duration:</strong> {stats['session_duration']}</p>
-        </div>
+    def _plotly_performance_chart(self) -> str:
+        """Generate performance chart using Plotly"""
+        return self._performance_figure().to_html(
+            include_plotlyjs='cdn', div_id='performance-chart', validate=False
+        )
+    
+    def _plotly_tool_usage_chart(self) -> str:
+        """Generate tool usage pie chart"""
+        fig = self._tool_usage_figure()
+        if fig is None:
+            return "<div>No tool usage data available yet</div>"
         
-        <div class="stats-grid">
-            <div class="stat-card">
-                <div class="stat-value total-executions">{stats['total_executions']}</div>
-                <div class="stat-label">Total Executions</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-value success-rate">{stats['success_rate']:.1f}%</div>
-                <div class="stat-label">Success Rate</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-value execution-time">{stats['average_execution_time']:.0f}ms</div>
-                <div class="stat-label">Avg Execution Time</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-value requests-per-minute">{stats['requests_per_minute']}</div>
-                <div class="stat-label">Requests/Minute</div>
-            </div>
-        </div>
+        return fig.to_html(include_plotlyjs='cdn', div_id='tool-usage-chart', validate=False)
+    
+    def _plotly_chart_json(self, builder: Callable[[], Any]) -> str:
+        """Encode a built figure as Plotly JSON"""
+        fig = builder()
+        if fig is None:
+            return json.dumps({"message": "No tool usage data available yet"})
+        return fig.to_json(validate=False)
+    
+    @staticmethod
+    def _plotly_missing_chart() -> str:
+        """Placeholder chart when plotly is not installed"""
+        return "<div>Charts require plotly installation</div>"
+    
+    @staticmethod
+    def _plotly_missing_chart_json(builder: Callable[[], Any]) -> str:
+        """Placeholder chart JSON when plotly is not installed"""
+        return json.dumps({"message": "Charts require plotly installation"})
+    
+    def get_chart_json(self, name: str) -> Optional[str]:
+        """Get a chart as JSON for the page to plot client-side, or None if unknown
         
-        <div class="charts-grid">
-            <div class="chart-container">
-                {self.generate_performance_chart()}
-            </div>
-            <div class="chart-container">
-                {self.generate_tool_usage_chart()}
-            </div>
-        </div>
+        Returns either a Plotly figure spec or a {"message": ...} placeholder.
+        """
+        builder = self._chart_builders.get(name)
+        if builder is None:
+            return None
         
-        <div class="real-time-log">
-            <h3>🔴 Real-time Execution Log</h3>
-            <div id="log-container">
-                <div class="log-entry log-info">Dashboard started - waiting for executions...</div>
-            </div>
-        </div>
-    </div>
+        return self._cached_chart(name, lambda: self._render_chart_json(builder))
     
-    <script>
-        // WebSocket connection for real-time updates
-        const ws = new WebSocket('ws://localhost:8888/ws');
-        const logContainer = document.getElementById('log-container');
-        const connectionStatus = document.getElementById('connection-status');
-        const connectionText = document.getElementById('connection-text');
-        
-        ws.onopen = function(event) {{
-            console.log('WebSocket connected');
-            connectionStatus.className = 'status-indicator status-online';
-            connectionText.textContent = 'Connected';
-        }};
-        
-        ws.onclose = function(event) {{
-            console.log('WebSocket disconnected');
-            connectionStatus.className = 'status-indicator status-offline';
-            connectionText.textContent = 'Disconnected';
-        }};
-        
-        ws.onmessage = function(event) {{
-            const message = JSON.parse(event.data);
-            
-            if (message.type === 'execution_update') {{
-                updateStats(message.summary);
-                addLogEntry(message.data);
-            }}
-        }};
-        
-        function updateStats(stats) {{
-            document.querySelector('.total-executions').textContent = stats.total_executions;
-            document.querySelector('.success-rate').textContent = stats.success_rate.toFixed(1) + '%';
-            document.querySelector('.execution-time').textContent = Math.round(stats.average_execution_time) + 'ms';
-            document.querySelector('.requests-per-minute').textContent = stats.requests_per_minute;
-        }}
-        
-        function addLogEntry(data) {{
-            const entry = document.createElement('div');
-            entry.className = `log-entry ${{data.success ? 'log-success' : 'log-error'}}`;
-            
-            const timestamp = new Date(data.timestamp).toLocaleTimeString();
-            const status = data.success ? '✅' : '❌';
-            const tool = data.tool_name;
-            const time = Math.round(data.execution_time_ms);
-            
-            entry.innerHTML = `${{timestamp}} ${{status}} ${{tool}} (${{time}}ms)`;
-            
-            if (data.error) {{
-                entry.innerHTML += `<br><small style="color: #d32f2f;">Error: ${{data.error.substring(0, 100)}}...</small>`;
-            }}
-            
-            logContainer.insertBefore(entry, logContainer.firstChild);
-            
-            // Keep only last 50 entries
-            while (logContainer.children.length > 50) {{
-                logContainer.removeChild(logContainer.lastChild);
-            }}
-        }}
-        
-        // Auto-refresh page every 5 minutes to get updated charts
-        setTimeout(() => {{
-            location.reload();
-        }}, 5 * 60 * 1000);
-    </script>
-</body>
-</html>
-"""
-        return html
+    def generate_dashboard_html(self) -> str:
+        """Generate complete dashboard HTML"""
+        stats = self.metrics_collector.get_summary_stats()
+        
+        return DASHBOARD_TEMPLATE.format(
+            session_duration=stats["session_duration"],
+            total_executions=stats["total_executions"],
+            success_rate=stats["success_rate"],
+            average_execution_time=stats["average_execution_time"],
+            requests_per_minute=stats["requests_per_minute"],
+            plotly_script=PLOTLY_SCRIPT_TAG
+        )
 
 class PerformanceMonitor:
     """Main performance monitoring class"""
@@ -527,11 +546,23 @@ class PerformanceMonitor:
     def setup_fastapi(self):
         """Setup FastAPI application"""
         self.app = FastAPI(title="Claude MCP Dashboard", version="1.0.0")
+        # The page and time series are text-heavy; compress anything non-trivial
+        self.app.add_middleware(GZipMiddleware, minimum_size=1024)
+        # Stylesheet and script are served separately so browsers can cache them
+        self.app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
         
         @self.app.get("/", response_class=HTMLResponse)
         async def dashboard():
             """Main dashboard page"""
-            return self.dashboard_generator.generate_dashboard_html()
+            return self.dashboard_generator.get_dashboard_html()
+        
+        @self.app.get("/api/chart/{name}")
+        async def get_chart(name: str):
+            """API endpoint for a chart's Plotly figure JSON"""
+            chart_json = self.dashboard_generator.get_chart_json(name)
+            if chart_json is None:
+                return JSONResponse({"message": f"Unknown chart: {name}"}, status_code=404)
+            return Response(content=chart_json, media_type="application/json")
         
         @self.app.get("/api/stats")
         async def get_stats():
@@ -547,16 +578,15 @@ class PerformanceMonitor:
         async def websocket_endpoint(websocket: WebSocket):
             """WebSocket endpoint for real-time updates"""
             await websocket.accept()
-            self.metrics_collector.websocket_connections.append(websocket)
+            self.metrics_collector.websocket_connections.add(websocket)
             
             try:
+                # Keep-alive uses protocol-level ping frames (WEBSOCKET_PING_INTERVAL);
+                # the client never sends, so this just waits for the disconnect
                 while True:
-                    # Keep connection alive
-                    await asyncio.sleep(30)
-                    await websocket.send_text(json.dumps({"type": "ping"}))
+                    await websocket.receive_text()
             except WebSocketDisconnect:
-                if websocket in self.metrics_collector.websocket_connections:
-                    self.metrics_collector.websocket_connections.remove(websocket)
+                self.metrics_collector.websocket_connections.discard(websocket)
     
     async def record_execution(
         self, 
@@ -577,7 +607,10 @@ class PerformanceMonitor:
             logging.warning("FastAPI not available. Monitoring dashboard disabled.")
             return
         
-        config = uvicorn.Config(self.app, host=host, port=port, log_level="info")
+        config = uvicorn.Config(
+            self.app, host=host, port=port, log_level="info",
+            ws_ping_interval=WEBSOCKET_PING_INTERVAL
+        )
         server = uvicorn.Server(config)
         
         # Start server in background
@@ -586,8 +619,16 @@ class PerformanceMonitor:
 # Global performance monitor instance
 performance_monitor = PerformanceMonitor()
 
-async def start_dashboard(port: int = 8888, open_browser: bool = True):
-    """Start the monitoring dashboard"""
+async def start_dashboard(
+    port: int = 8888,
+    open_browser: bool = True,
+    monitor: Optional[PerformanceMonitor] = None
+):
+    """Start the monitoring dashboard
+    
+    Serves the given monitor (the one metrics are recorded into), falling back
+    to the module-level instance, so no second app is built.
+    """
     if not HAS_FASTAPI:
         print("⚠️  Monitoring dashboard requires FastAPI. Install with: pip install fastapi uvicorn")
         return
@@ -601,7 +642,7 @@ async def start_dashboard(port: int = 8888, open_browser: bool = True):
         import threading
         threading.Thread(target=open_browser_delayed, daemon=True).start()
     
-    await performance_monitor.start_server(port=port)
+    await (monitor or performance_monitor).start_server(port=port)
 
 def main():
     """Main entry point for standalone dashboard"""
@@ -0,0 +1,99 @@
+// WebSocket connection for real-time updates
+const ws = new WebSocket('ws://localhost:8888/ws');
+const logContainer = document.getElementById('log-container');
+const connectionStatus = document.getElementById('connection-status');
+const connectionText = document.getElementById('connection-text');
+const textDecoder = new TextDecoder();
+const CHART_REFRESH_MS = 5000;
+let chartRefreshTimer = null;
+ws.binaryType = 'arraybuffer';
+
+ws.onopen = function(event) {
+    console.log('WebSocket connected');
+    connectionStatus.className = 'status-indicator status-online';
+    connectionText.textContent = 'Connected';
+};
+
+ws.onclose = function(event) {
+    console.log('WebSocket disconnected');
+    connectionStatus.className = 'status-indicator status-offline';
+    connectionText.textContent = 'Disconnected';
+};
+
+ws.onmessage = function(event) {
+    // Updates arrive as binary UTF-8 JSON frames
+    const raw = typeof event.data === 'string' ? event.data : textDecoder.decode(event.data);
+    const message = JSON.parse(raw);
+
+    if (message.type === 'batch') {
+        updateStats(message.summary);
+        message.metrics.forEach(addLogEntry);
+        scheduleChartRefresh();
+    }
+};
+
+function updateStats(stats) {
+    document.querySelector('.total-executions').textContent = stats.total_executions;
+    document.querySelector('.success-rate').textContent = stats.success_rate.toFixed(1) + '%';
+    document.querySelector('.execution-time').textContent = Math.round(stats.average_execution_time) + 'ms';
+    document.querySelector('.requests-per-minute').textContent = stats.requests_per_minute;
+}
+
+function addLogEntry(data) {
+    const entry = document.createElement('div');
+    entry.className = `log-entry ${data.success ? 'log-success' : 'log-error'}`;
+
+    const timestamp = new Date(data.timestamp).toLocaleTimeString();
+    const status = data.success ? '✅' : '❌';
+    const tool = data.tool_name;
+    const time = Math.round(data.execution_time_ms);
+
+    entry.innerHTML = `${timestamp} ${status} ${tool} (${time}ms)`;
+
+    if (data.error) {
+        entry.innerHTML += `<br><small style="color: #d32f2f;">Error: ${data.error.substring(0, 100)}...</small>`;
+    }
+
+    logContainer.insertBefore(entry, logContainer.firstChild);
+
+    // Keep only last 50 entries
+    while (logContainer.children.length > 50) {
+        logContainer.removeChild(logContainer.lastChild);
+    }
+}
+
+// Charts plot server-side aggregates (bucket averages, success rate), so
+// re-fetch them at most once per interval instead of plotting raw executions
+function scheduleChartRefresh() {
+    if (chartRefreshTimer !== null) {
+        return;
+    }
+    chartRefreshTimer = setTimeout(() => {
+        chartRefreshTimer = null;
+        loadCharts();
+    }, CHART_REFRESH_MS);
+}
+
+// Charts are fetched as JSON and drawn in the browser
+function loadChart(name, elementId) {
+    const element = document.getElementById(elementId);
+    fetch('/api/chart/' + name)
+        .then(response => response.json())
+        .then(spec => {
+            if (spec.message || typeof Plotly === 'undefined') {
+                element.textContent = spec.message || 'Charts require plotly installation';
+            } else {
+                Plotly.react(elementId, spec.data, spec.layout, {responsive: true});
+            }
+        })
+        .catch(() => {
+            element.textContent = 'Chart unavailable';
+        });
+}
+
+function loadCharts() {
+    loadChart('performance', 'performance-chart');
+    loadChart('tool_usage', 'tool-usage-chart');
+}
+
+loadCharts();
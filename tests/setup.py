@@ -509,7 +509,7 @@ src_dir = Path(__file__).parent / "src"
 sys.path.insert(0, str(src_dir))
 
 try:
-    from monitoring.dashboard import start_dashboard
+    from monitoring.monitoring_dashboard import start_dashboard
     import asyncio
     
     print("🚀 Starting Claude MCP Monitoring Dashboard...")
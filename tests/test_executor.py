@@ -206,6 +206,21 @@ class TestCodeExecutor:
         assert result1.output == result2.output
         assert result1.code_hash == result2.code_hash
     
+    @pytest.mark.asyncio
+    async def test_cache_evicts_least_recently_used(self, executor):
+        """Test that the result cache stays bounded and evicts the least recently used entry"""
+        executor.cache_size = 2
+        
+        first = await executor.execute_code("print(0)")
+        second = await executor.execute_code("print(1)")
+        # A hit makes print(0) the most recently used, so print(1) goes next
+        assert await executor.execute_code("print(0)") is first
+        await executor.execute_code("print(2)")
+        
+        assert len(executor.execution_cache) == 2
+        assert await executor.execute_code("print(0)") is first
+        assert await executor.execute_code("print(1)") is not second
+    
     @pytest.mark.asyncio
     async def test_timeout_handling(self):
         """Test that timeouts are handled properly"""
@@ -248,6 +263,16 @@ print('This should timeout')
         assert len(issues) > 0
         assert any("system" in issue.lower() for issue in issues)
     
+    def test_security_check_is_memoized_safely(self, executor):
+        """Test that repeated checks return fresh lists with the same issues"""
+        dangerous_code = "eval('1 + 1')"
+        
+        first = executor._security_check(dangerous_code)
+        first.append("mutated by caller")
+        second = executor._security_check(dangerous_code)
+        
+        assert second == ["Code evaluation (eval()"]
+    
     def test_error_suggestions(self, executor):
         """Test error suggestion generation"""
         # Test NameError suggestions
@@ -330,6 +355,56 @@ class TestSecurityStrategies:
         
         assert success is True
         assert "subprocess test" in output
+    
+    @pytest.mark.asyncio
+    async def test_subprocess_timeout_is_isolated(self):
+        """Test a runaway snippet times out without affecting concurrent ones"""
+        strategy = SubprocessStrategy()
+        
+        runaway, first, second = await asyncio.gather(
+            strategy.execute("while True:\n    pass", 1.0),
+            strategy.execute("print('first')", 1.0),
+            strategy.execute("print('second')", 1.0)
+        )
+        
+        assert runaway[2] is False
+        assert "timed out" in runaway[1]
+        assert first == ("first\n", "", True)
+        assert second == ("second\n", "", True)
+    
+    @pytest.mark.asyncio
+    async def test_subprocess_syntax_error_caught_in_parent(self, monkeypatch):
+        """Test code that doesn't compile is rejected without starting a process"""
+        import core.executor as executor_module
+        started = Mock()
+        monkeypatch.setattr(executor_module.mp, "Process", started)
+        strategy = SubprocessStrategy()
+        
+        output, error, success = await strategy.execute("print('unclosed'", 5.0)
+        
+        assert success is False
+        assert error.startswith("SyntaxError")
+        started.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_queue_wait_not_counted_as_execution_time(self, monkeypatch):
+        """Test time spent waiting for a worker slot isn't reported as execution time"""
+        import core.executor as executor_module
+        monkeypatch.setattr(executor_module, "MAX_SUBPROCESS_WORKERS", 1)
+        monkeypatch.setattr(executor_module, "_subprocess_slots", executor_module.weakref.WeakKeyDictionary())
+        executor = CodeExecutor()
+        
+        start = time.perf_counter()
+        results = await asyncio.gather(*(
+            executor.execute_code(f"total = 0\nfor i in range(300000):\n    total += {n}")
+            for n in range(4)
+        ))
+        wall_ms = (time.perf_counter() - start) * 1000
+        
+        assert all(result.status == ExecutionStatus.SUCCESS for result in results)
+        # Runs are serialized, so a clock started before the slot would make
+        # the last result report nearly the whole wall time
+        assert max(result.execution_time_ms for result in results) < wall_ms / 2
 
 class TestPerformanceMetrics:
     """Test performance measurement functionality"""
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the monitoring dashboard metrics
+"""
+
+import asyncio
+import json
+import pytest
+import re
+from pathlib import Path
+import sys
+
+# Add src to path for imports
+src_dir = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_dir))
+
+from monitoring.monitoring_dashboard import BROADCAST_INTERVAL, DashboardGenerator, MetricsCollector
+
+class TestMetricsCollector:
+    """Test incremental metric aggregation"""
+    
+    @pytest.mark.asyncio
+    async def test_average_tracks_evicted_history(self):
+        """Test the running average only covers entries still in history"""
+        collector = MetricsCollector(max_history=3)
+        
+        for execution_time in (100.0, 10.0, 20.0, 30.0):
+            await collector.record_execution("execute_python_code", execution_time, True)
+        
+        assert len(collector.metrics_history) == 3
+        assert collector.real_time_metrics["average_execution_time"] == pytest.approx(20.0)
+    
+    @pytest.mark.asyncio
+    async def test_requests_per_minute(self):
+        """Test requests per minute counts every recent execution"""
+        collector = MetricsCollector(max_history=2)
+        
+        for _ in range(5):
+            await collector.record_execution("execute_python_code", 1.0, True)
+        
+        assert collector.real_time_metrics["requests_per_minute"] == 5
+    
+    @pytest.mark.asyncio
+    async def test_broadcast_drops_failed_websockets(self):
+        """Test a failing client is removed while the others still get the batched update"""
+        class FakeWebSocket:
+            def __init__(self, fail: bool):
+                self.fail = fail
+                self.sent = []
+            
+            async def send_bytes(self, payload: bytes):
+                if self.fail:
+                    raise ConnectionError("client went away")
+                self.sent.append(payload)
+        
+        collector = MetricsCollector()
+        healthy, broken = FakeWebSocket(fail=False), FakeWebSocket(fail=True)
+        collector.websocket_connections.update({healthy, broken})
+        
+        await collector.record_execution("execute_python_code", 5.0, True)
+        await collector.record_execution("execute_python_code", 6.0, True)
+        await collector.flush_updates()
+        
+        assert collector.websocket_connections == {healthy}
+        assert len(healthy.sent) == 1
+        assert len(json.loads(healthy.sent[0])["metrics"]) == 2
+    
+    @pytest.mark.asyncio
+    async def test_time_series_buckets(self):
+        """Test executions are aggregated into 5-minute buckets"""
+        collector = MetricsCollector()
+        
+        await collector.record_execution("execute_python_code", 10.0, True)
+        await collector.record_execution("execute_python_code", 30.0, False, error="ValueError: bad")
+        
+        data = collector.get_time_series_data()
+        assert len(data["timestamps"]) == 1
+        assert data["execution_times"] == [pytest.approx(20.0)]
+        assert data["success_rates"] == [pytest.approx(50.0)]
+    
+    @pytest.mark.asyncio
+    async def test_updates_flushed_after_interval(self):
+        """Test pending updates are broadcast without an explicit flush"""
+        class FakeWebSocket:
+            def __init__(self):
+                self.sent = []
+            
+            async def send_bytes(self, payload: bytes):
+                self.sent.append(payload)
+        
+        collector = MetricsCollector()
+        websocket = FakeWebSocket()
+        collector.websocket_connections.add(websocket)
+        
+        await collector.record_execution("execute_python_code", 5.0, True)
+        assert websocket.sent == []
+        
+        await asyncio.sleep(BROADCAST_INTERVAL * 4)
+        assert len(websocket.sent) == 1
+
+class TestDashboardGenerator:
+    """Test dashboard page caching"""
+    
+    @pytest.mark.asyncio
+    async def test_page_reused_until_new_execution(self):
+        """Test the rendered page is reused until an execution is recorded"""
+        collector = MetricsCollector()
+        generator = DashboardGenerator(collector)
+        
+        first = generator.get_dashboard_html()
+        assert generator.get_dashboard_html() is first
+        
+        await collector.record_execution("execute_python_code", 5.0, True)
+        assert generator.get_dashboard_html() is not first
+    
+    def test_chart_json(self):
+        """Test charts are served as JSON and unknown names are rejected"""
+        generator = DashboardGenerator(MetricsCollector())
+        
+        assert generator.get_chart_json("unknown") is None
+        assert "message" in json.loads(generator.get_chart_json("tool_usage"))
+    
+    def test_scripts_do_not_block_render(self):
+        """Test every external script on the page is deferred"""
+        html = DashboardGenerator(MetricsCollector()).get_dashboard_html()
+        scripts = re.findall(r"<script[^>]*>", html)
+        
+        assert scripts
+        assert all(" defer" in tag for tag in scripts)
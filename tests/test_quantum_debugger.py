@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the quantum debugging engine
+"""
+
+import asyncio
+import pytest
+from pathlib import Path
+import sys
+
+# Add src to path for imports
+src_dir = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_dir))
+
+from core.quantum_debugger import CodeFeatures, CodeVariant, QuantumDebugger, VariantGenerator
+
+class TestCodeFeatures:
+    """Test single-pass feature extraction"""
+    
+    def test_loop_features(self):
+        """Test loop, append and augmented assignment detection"""
+        features = CodeFeatures.from_code(
+            "result = []\nfor i in range(10):\n    result.append(i)\ntotal = 0\ntotal += 1"
+        )
+        
+        assert features.is_valid
+        assert features.has_for
+        assert features.has_append
+        assert features.has_aug_assign
+        assert not features.has_annotations
+        assert features.line_count == 5
+    
+    def test_math_and_annotation_features(self):
+        """Test multiplication, sum-over-range and annotation detection"""
+        features = CodeFeatures.from_code(
+            "def sum_of_squares(n: int) -> int:\n    return sum(i * i for i in range(n))"
+        )
+        
+        assert features.has_multiplication
+        assert features.has_sum_over_range
+        assert features.has_annotations
+        assert "sum_of_squares" in features.names
+    
+    def test_invalid_code(self):
+        """Test that unparseable code yields empty features"""
+        features = CodeFeatures.from_code("def broken(:")
+        
+        assert not features.is_valid
+        assert not features.has_for
+        assert features.line_count == 1
+
+class TestVariantGenerator:
+    """Test variant generation predicates"""
+    
+    @pytest.mark.asyncio
+    async def test_list_comprehension_variant(self):
+        """Test that simple append loops produce a list comprehension variant"""
+        generator = VariantGenerator()
+        code = "result = []\nfor i in range(10):\n    result.append(i * 2)"
+        
+        variants = await generator.generate_variants(code, focus="speed")
+        variant_ids = [v.id for v in variants]
+        
+        assert "original" in variant_ids
+        assert "list_comprehension" in variant_ids
+    
+    def test_duplicate_variants_are_dropped(self):
+        """Test that variants repeating existing code are removed"""
+        generator = VariantGenerator()
+        variants = [
+            CodeVariant(id="original", code="x = 1", description="Original", confidence=0.8),
+            CodeVariant(id="same_as_original", code="x = 1", description="No-op", confidence=0.9),
+            CodeVariant(id="low", code="x = 2", description="Low", confidence=0.5),
+            CodeVariant(id="high", code="x = 2", description="High", confidence=0.7)
+        ]
+        
+        deduplicated = generator._deduplicate(variants)
+        
+        assert [v.id for v in deduplicated] == ["original", "high"]
+    
+    @pytest.mark.skipif(sys.version_info < (3, 9), reason="ast.unparse requires Python 3.9+")
+    def test_set_membership_rewrite_preserves_other_brackets(self):
+        """Test that only literal membership lists are turned into sets"""
+        generator = VariantGenerator()
+        code = "items = [1, 2]\nfor x in range(3):\n    print(x in [1, 2], items[0])"
+        
+        optimized = generator._optimize_with_sets(code)
+        
+        assert "x in {1, 2}" in optimized
+        assert "items = [1, 2]" in optimized
+        assert "items[0]" in optimized
+
+class TestQuantumDebugger:
+    """Test the quantum debugging engine"""
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_queued_variants_never_start(self):
+        """Test variants still waiting for a slot create no coroutine when cancelled"""
+        created = []
+        
+        class BlockingExecutor:
+            async def execute_code(self, code):
+                await asyncio.Event().wait()
+        
+        debugger = QuantumDebugger(BlockingExecutor())
+        debugger.max_concurrency = 1
+        
+        def test_variant(variant):
+            created.append(variant.id)
+            return debugger.executor.execute_code(variant.code)
+        
+        debugger._test_variant = test_variant
+        variants = [
+            CodeVariant(id=f"v{i}", code=f"x = {i}", description="", confidence=0.5)
+            for i in range(3)
+        ]
+        
+        task = asyncio.ensure_future(debugger.test_variants(variants))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        
+        assert created == ["v0"]
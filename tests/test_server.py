@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the MCP server
+"""
+
+import asyncio
+import importlib.util
+import json
+import logging
+import pytest
+import queue
+import threading
+from pathlib import Path
+import sys
+
+# Add src to path for imports
+src_dir = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_dir))
+
+pytest.importorskip("mcp.types", reason="MCP SDK not installed")
+
+# src/mcp would shadow the SDK's package name, so load the server module by path
+_spec = importlib.util.spec_from_file_location("claude_mcp_server", src_dir / "mcp" / "server.py")
+server_module = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(server_module)
+
+@pytest.fixture
+def make_server(monkeypatch):
+    """Factory for servers running on the core executor, without the optional components"""
+    monkeypatch.setattr(server_module, "CORE_AVAILABLE", True)
+    
+    def factory(**overrides):
+        options = dict(enable_quantum=False, enable_learning=False, enable_monitoring=False)
+        options.update(overrides)
+        return server_module.ClaudeDesktopMCPServer(server_module.ServerConfig(**options))
+    
+    return factory
+
+class TestLogging:
+    """Test the queued log pipeline"""
+    
+    @pytest.mark.asyncio
+    async def test_text_lines_formatted_once(self, make_server, capsys):
+        """Test records are formatted only by the listener's formatter"""
+        async with make_server() as server:
+            # basicConfig gives the queue handler this formatter in a fresh process
+            server._log_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+            server.logger.info("hello %s", "world")
+        
+        lines = [line for line in capsys.readouterr().err.splitlines() if "hello" in line]
+        assert len(lines) == 1
+        assert lines[0].endswith("| INFO | mcp_server | hello world")
+    
+    @pytest.mark.asyncio
+    async def test_json_lines_keep_exception_info(self, make_server, capsys):
+        """Test JSON records carry the plain message, extra fields and the traceback"""
+        async with make_server(log_format="json") as server:
+            server._log_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+            try:
+                1 / 0
+            except ZeroDivisionError:
+                server.logger.exception("failed %s", "badly", extra={"tool": "execute_python_code"})
+        
+        lines = [line for line in capsys.readouterr().err.splitlines() if "failed badly" in line]
+        assert len(lines) == 1
+        entry = json.loads(lines[0])
+        assert entry["level"] == "ERROR"
+        assert entry["msg"] == "failed badly"
+        assert entry["tool"] == "execute_python_code"
+        assert "ZeroDivisionError" in entry["exc_info"]
+    
+    def test_listener_stops_with_full_queue(self, monkeypatch):
+        """Test stopping the listener doesn't fail when the sink stalled and the queue filled up"""
+        monkeypatch.setattr(server_module, "LOG_SENTINEL_TIMEOUT", 0.05)
+        released = threading.Event()
+        
+        class StalledHandler(logging.Handler):
+            def emit(self, record):
+                released.wait(5)
+        
+        log_queue = queue.Queue(maxsize=2)
+        listener = server_module.BoundedQueueListener(log_queue, StalledHandler())
+        listener.start()
+        handler = server_module.DroppingQueueHandler(log_queue)
+        for i in range(4):
+            handler.handle(logging.makeLogRecord({"msg": f"record {i}"}))
+        
+        assert log_queue.full()
+        threading.Timer(0.2, released.set).start()
+        listener.stop()
+        assert handler.dropped > 0
+
+class TestCircuitBreaker:
+    """Test that identical failing calls stop being re-run"""
+    
+    @staticmethod
+    def _failing_handler(server):
+        calls = []
+        
+        async def handler(args, request_id):
+            calls.append(args)
+            raise RuntimeError("boom")
+        
+        server._tool_handlers["execute_code"] = handler
+        return calls
+    
+    @pytest.mark.asyncio
+    async def test_trips_after_repeated_failures(self, make_server):
+        """Test the call is refused once it has failed the threshold number of times"""
+        async with make_server() as server:
+            calls = self._failing_handler(server)
+            args = {"code": "print(1)", "description": "a"}
+            
+            for _ in range(server_module.CIRCUIT_FAILURE_THRESHOLD):
+                result = await server._call_tool("execute_code", args)
+                assert "Tool Execution Failed" in result.content[0].text
+            
+            # Same arguments in a different key order are the same call
+            result = await server._call_tool("execute_code", {"description": "a", "code": "print(1)"})
+            assert result.isError
+            assert "Repeated Failure Detected" in result.content[0].text
+            assert len(calls) == server_module.CIRCUIT_FAILURE_THRESHOLD
+            assert server.circuit_breaks == 1
+            
+            # Any other argument makes it a different call
+            await server._call_tool("execute_code", {"code": "print(1)", "description": "b"})
+            assert len(calls) == server_module.CIRCUIT_FAILURE_THRESHOLD + 1
+    
+    @pytest.mark.asyncio
+    async def test_validation_errors_not_counted(self, make_server):
+        """Test static validation errors never trip the circuit"""
+        async with make_server() as server:
+            for _ in range(server_module.CIRCUIT_FAILURE_THRESHOLD + 1):
+                result = await server._call_tool("execute_code", {"code": "  "})
+                assert "No code provided" in result.content[0].text
+            
+            assert not server._failure_signatures
+            assert server.circuit_breaks == 0
+    
+    @pytest.mark.asyncio
+    async def test_window_expiry(self, make_server, monkeypatch):
+        """Test failures older than the window no longer block the call"""
+        monkeypatch.setattr(server_module, "CIRCUIT_WINDOW_SECONDS", -1.0)
+        async with make_server() as server:
+            calls = self._failing_handler(server)
+            
+            for _ in range(server_module.CIRCUIT_FAILURE_THRESHOLD + 1):
+                await server._call_tool("execute_code", {"code": "print(1)"})
+            
+            assert len(calls) == server_module.CIRCUIT_FAILURE_THRESHOLD + 1
+            assert server.circuit_breaks == 0
+    
+    @pytest.mark.asyncio
+    async def test_signature_cap(self, make_server, monkeypatch):
+        """Test only the most recent failure signatures are kept"""
+        monkeypatch.setattr(server_module, "CIRCUIT_MAX_SIGNATURES", 2)
+        async with make_server() as server:
+            self._failing_handler(server)
+            
+            for i in range(3):
+                await server._call_tool("execute_code", {"code": f"print({i})"})
+            
+            assert len(server._failure_signatures) == 2
+            assert server._failure_signature("execute_code", {"code": "print(0)"}) not in server._failure_signatures
+            assert server._failure_signature("execute_code", {"code": "print(2)"}) in server._failure_signatures
+
+class TestBatchExecute:
+    """Test batched tool calls"""
+    
+    @staticmethod
+    def _echo_handler(server):
+        """Replace execute_code with a handler that echoes its code after an optional delay"""
+        async def handler(args, request_id):
+            await asyncio.sleep(args.get("delay", 0))
+            if args.get("fail"):
+                return server_module._static_error(f"failed {args['code']}")
+            return server_module.CallToolResult(
+                content=[server_module.TextContent(type="text", text=f"ran {args['code']}")]
+            )
+        
+        server._tool_handlers["execute_code"] = handler
+    
+    @staticmethod
+    def _texts(result):
+        return [item.text for item in result.content]
+    
+    @pytest.mark.asyncio
+    async def test_results_in_input_order(self, make_server):
+        """Test results follow input order, not completion order"""
+        async with make_server() as server:
+            self._echo_handler(server)
+            operations = [
+                {"tool": "execute_code", "arguments": {"code": "a", "delay": 0.05}},
+                {"tool": "execute_code", "arguments": {"code": "b", "delay": 0.01}},
+                {"tool": "execute_code", "arguments": {"code": "c"}},
+            ]
+            result = await server._call_tool("batch_execute", {"operations": operations})
+        
+        assert not result.isError
+        assert [text for text in self._texts(result) if text.startswith("ran")] == ["ran a", "ran b", "ran c"]
+    
+    @pytest.mark.asyncio
+    async def test_stop_on_error_skips_remaining(self, make_server):
+        """Test operations not yet started are skipped after a failure"""
+        async with make_server() as server:
+            self._echo_handler(server)
+            operations = [
+                {"tool": "execute_code", "arguments": {"code": "a", "fail": True}},
+                {"tool": "execute_code", "arguments": {"code": "b"}},
+            ]
+            result = await server._call_tool(
+                "batch_execute", {"operations": operations, "maxConcurrent": 1, "stopOnError": True}
+            )
+        
+        texts = self._texts(result)
+        assert result.isError
+        assert "failed a" in texts
+        assert "ran b" not in texts
+        assert any("Skipped after an earlier failure" in text for text in texts)
+    
+    @pytest.mark.asyncio
+    async def test_nested_batch_rejected(self, make_server):
+        """Test a batch can't contain another batch"""
+        async with make_server() as server:
+            self._echo_handler(server)
+            operations = [
+                {"tool": "batch_execute", "arguments": {"operations": []}},
+                {"tool": "execute_code", "arguments": {"code": "a"}},
+            ]
+            result = await server._call_tool("batch_execute", {"operations": operations})
+        
+        texts = self._texts(result)
+        assert result.isError
+        assert any("Nested batch_execute calls are not supported" in text for text in texts)
+        assert "ran a" in texts
+    
+    @pytest.mark.asyncio
+    async def test_malformed_operations_fail_individually(self, make_server):
+        """Test a malformed operation gets its own error without cancelling the batch"""
+        async with make_server() as server:
+            self._echo_handler(server)
+            operations = [
+                "execute_code",
+                {"arguments": {"code": "x"}},
+                {"tool": "execute_code", "arguments": ["x"]},
+                {"tool": "execute_code", "arguments": {"code": "a"}},
+            ]
+            result = await server._call_tool("batch_execute", {"operations": operations})
+        
+        texts = self._texts(result)
+        assert result.isError
+        assert "❌ Batch operation must be an object, got str" in texts
+        assert "❌ Batch operation is missing a tool name" in texts
+        assert "❌ Batch operation arguments must be an object" in texts
+        assert texts[-1] == "ran a"
+
+class TestMonitoring:
+    """Test the performance monitoring wiring"""
+    
+    @pytest.mark.asyncio
+    async def test_dashboard_serves_recorded_metrics(self, make_server, monkeypatch):
+        """Test the dashboard is started on the same monitor tool calls are recorded into"""
+        dashboard_module = pytest.importorskip("monitoring.monitoring_dashboard")
+        served = []
+        
+        async def start_dashboard(port=8888, open_browser=True, monitor=None):
+            served.append(monitor)
+        
+        monkeypatch.setattr(dashboard_module, "start_dashboard", start_dashboard)
+        
+        async with make_server(enable_monitoring=True) as server:
+            # Only the dashboard check sees FastAPI; the monitor was built without it
+            monkeypatch.setattr(dashboard_module, "HAS_FASTAPI", True)
+            await server._dashboard_task
+            await server._call_tool("get_insights", {})
+        
+        assert isinstance(server.performance_monitor, dashboard_module.PerformanceMonitor)
+        assert served == [server.performance_monitor]
+        metrics = server.performance_monitor.metrics_collector.real_time_metrics
+        assert metrics["tool_usage"]["get_insights"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_dashboard_skipped_without_fastapi(self, make_server, monkeypatch, capsys):
+        """Test a missing FastAPI is logged rather than printed onto the protocol stream"""
+        dashboard_module = pytest.importorskip("monitoring.monitoring_dashboard")
+        monkeypatch.setattr(dashboard_module, "HAS_FASTAPI", False)
+        
+        async with make_server(enable_monitoring=True) as server:
+            await server._dashboard_task
+        
+        captured = capsys.readouterr()
+        assert captured.out == ""
+        assert "requires FastAPI" in captured.err